@@ -1,14 +1,43 @@
 from __future__ import annotations
 
 import heapq
+from typing import Iterator
 
-from ..core.grid import Grid, Pos
-from ..core.result import SearchResult
-from .common import AlgorithmConfig, emit, manhattan, neighbors4, new_result, reconstruct_path
+from ..core.grid import FlatGrid, Grid, Pos
+from ..core.result import SearchResult, SearchStats
+from ..core.trace import DONE, FRONTIER_ADD, FRONTIER_POP, GOAL_FOUND, INIT, PATH, VISIT
+from .common import (
+    HEURISTICS, AlgorithmConfig, BucketQueue, IndexedHeap, SearchStepper, as_flat, collect_trace, drain, emit,
+    fill_pos_form, finish_trace, manhattan, neighbors4, new_id_buffer, new_result, new_trace, reconstruct_path,
+    reconstruct_path_ids, step_costs,
+)
+
+INF = 2**31 - 1
 
 
 def run(grid: Grid, start: Pos, goal: Pos, cfg: AlgorithmConfig | None = None) -> SearchResult:
     cfg = cfg or AlgorithmConfig()
+    if grid.costs is not None or not cfg.default_search:
+        # Terrain costs (every step costs at least 1, so Manhattan stays admissible) or a
+        # non-default heuristic / tie-break / weight / queue: the tuned quiet loops cover
+        # plain Manhattan A*, the event loop everything else
+        if cfg.emit_trace or cfg.heuristic != "manhattan" or cfg.weight != 1.0:
+            return _run_configured(grid, start, goal, cfg)
+        if cfg.queue == "bucket":
+            res = _run_bucket_quiet(grid, start, goal, cfg.tie_break == "lifo")
+        elif cfg.default_search:
+            res = _run_ids_quiet(grid, start, goal)
+        else:
+            return _run_configured(grid, start, goal, cfg)
+        if not cfg.compact:
+            fill_pos_form(res, grid.width)
+        return res
+    if cfg.compact or cfg.packed_trace:
+        if not cfg.emit_trace:
+            return _run_ids_quiet(grid, start, goal)
+        return _run_ids(grid, start, goal, cfg)
+    if not cfg.emit_trace:
+        return _run_quiet(grid, start, goal)
 
     res = new_result(start, goal)
     emit(res, cfg, "init", {"algo": "A*", "start": start, "goal": goal})
@@ -26,6 +55,7 @@ def run(grid: Grid, start: Pos, goal: Pos, cfg: AlgorithmConfig | None = None) -
 
     open_heap: list[tuple[int, int, Pos]] = []
     tie = 0
+    stale = 0
     heapq.heappush(open_heap, (manhattan(start, goal), tie, start))
     emit(res, cfg, "frontier_add", start)
 
@@ -35,6 +65,7 @@ def run(grid: Grid, start: Pos, goal: Pos, cfg: AlgorithmConfig | None = None) -
     while open_heap:
         _, _, current = heapq.heappop(open_heap)
         if current in closed:
+            stale += 1
             continue
 
         in_open.discard(current)
@@ -66,6 +97,7 @@ def run(grid: Grid, start: Pos, goal: Pos, cfg: AlgorithmConfig | None = None) -
                     in_open.add(nb)
                     emit(res, cfg, "frontier_add", nb)
 
+    _count_queue_ops(res.stats, tie + 1, stale)
     res.stats.visited = len(g_score)
     if res.found:
         res.path = reconstruct_path(res.came_from, start, goal)
@@ -74,3 +106,466 @@ def run(grid: Grid, start: Pos, goal: Pos, cfg: AlgorithmConfig | None = None) -
 
     emit(res, cfg, "done", {"found": res.found})
     return res
+
+
+def _run_quiet(grid: Grid, start: Pos, goal: Pos) -> SearchResult:
+    # Same search as run() with every trace call stripped out of the loop
+    res = new_result(start, goal)
+
+    if start == goal:
+        res.found = True
+        res.path = [start]
+        res.stats.path_length = 1
+        return res
+
+    g_score: dict[Pos, int] = {start: 0}
+    gx, gy = goal
+
+    open_heap: list[tuple[int, int, Pos]] = []
+    tie = 0
+    stale = 0
+    heapq.heappush(open_heap, (manhattan(start, goal), tie, start))
+
+    closed: set[Pos] = set()
+    came_from = res.came_from
+    order = res.visited_order
+    nbs = grid.neighbors4
+    push = heapq.heappush
+    pop = heapq.heappop
+
+    while open_heap:
+        _, _, current = pop(open_heap)
+        if current in closed:
+            stale += 1
+            continue
+
+        order.append(current)
+
+        if current == goal:
+            res.found = True
+            break
+
+        closed.add(current)
+
+        tentative_g = g_score[current] + 1
+        for nb in nbs(current):
+            if nb in closed:
+                continue
+
+            if tentative_g < g_score.get(nb, 10**9):
+                came_from[nb] = current
+                g_score[nb] = tentative_g
+                x, y = nb
+                tie += 1
+                push(open_heap, (tentative_g + abs(x - gx) + abs(y - gy), tie, nb))
+
+    res.stats.expanded = len(order)
+    _count_queue_ops(res.stats, tie + 1, stale)
+    res.stats.visited = len(g_score)
+    if res.found:
+        res.path = reconstruct_path(came_from, start, goal)
+        res.stats.path_length = len(res.path)
+    return res
+
+
+def stream(grid: Grid, start: Pos, goal: Pos, cfg: AlgorithmConfig | None = None) -> SearchStepper:
+    fg = as_flat(grid)
+    res = new_result(start, goal)
+    if fg.costs is not None or (cfg is not None and not cfg.default_search):
+        return SearchStepper(_events_configured(fg, start, goal, res, cfg or AlgorithmConfig()), res, fg.width)
+    return SearchStepper(_events(fg, start, goal, res), res, fg.width)
+
+
+def _count_queue_ops(stats: SearchStats, pushes: int, stale: int) -> None:
+    # Every pop either expands a node or skips a stale duplicate
+    stats.pushes = pushes
+    stats.stale_pops = stale
+    stats.pops = stats.expanded + stale
+
+
+def _run_ids(grid: Grid, start: Pos, goal: Pos, cfg: AlgorithmConfig) -> SearchResult:
+    fg = as_flat(grid)
+    res = new_result(start, goal)
+    trace = new_trace(fg, "A*", start, goal)
+    collect_trace(_events(fg, start, goal, res), trace)
+    finish_trace(res, cfg, trace)
+    return res
+
+
+def _events(fg: FlatGrid, start: Pos, goal: Pos, res: SearchResult) -> Iterator[tuple[int, int]]:
+    w = fg.width
+    s = fg.index(start)
+    g = fg.index(goal)
+    yield INIT, s
+
+    if start == goal:
+        res.found = True
+        res.path = [start]
+        res.stats.path_length = 1
+        yield GOAL_FOUND, g
+        yield PATH, -1
+        yield DONE, 1
+        return
+
+    gx, gy = goal
+    n = fg.size
+    parents = new_id_buffer(n)
+    parents[s] = s
+    res.parents = parents
+    g_score = new_id_buffer(n, INF)
+    g_score[s] = 0
+    stats = res.stats
+    stats.visited = 1
+
+    open_heap: list[tuple[int, int, int]] = []
+    tie = 0
+    stale = 0
+    heapq.heappush(open_heap, (manhattan(start, goal), tie, s))
+    yield FRONTIER_ADD, s
+
+    in_open = bytearray(n)
+    in_open[s] = 1
+    closed = bytearray(n)
+
+    order = res.visited_ids
+    nbs = fg.neighbor_ids
+    push = heapq.heappush
+    pop = heapq.heappop
+
+    while open_heap:
+        _, _, current = pop(open_heap)
+        if closed[current]:
+            stale += 1
+            continue
+
+        in_open[current] = 0
+        yield FRONTIER_POP, current
+
+        order.append(current)
+        stats.expanded += 1
+        yield VISIT, current
+
+        if current == g:
+            res.found = True
+            yield GOAL_FOUND, g
+            break
+
+        closed[current] = 1
+
+        tentative_g = g_score[current] + 1
+        for nb in nbs(current):
+            if closed[nb]:
+                continue
+
+            old_g = g_score[nb]
+            if tentative_g < old_g:
+                if old_g == INF:
+                    stats.visited += 1
+                parents[nb] = current
+                g_score[nb] = tentative_g
+                y, x = divmod(nb, w)
+                tie += 1
+                push(open_heap, (tentative_g + abs(x - gx) + abs(y - gy), tie, nb))
+                if not in_open[nb]:
+                    in_open[nb] = 1
+                    yield FRONTIER_ADD, nb
+
+    _count_queue_ops(stats, tie + 1, stale)
+    if res.found:
+        res.path = reconstruct_path_ids(parents, s, g, w)
+        stats.path_length = len(res.path)
+        yield PATH, -1
+
+    yield DONE, 1 if res.found else 0
+
+
+def _run_ids_quiet(grid: Grid, start: Pos, goal: Pos) -> SearchResult:
+    fg = as_flat(grid)
+    w = fg.width
+
+    res = new_result(start, goal)
+
+    if start == goal:
+        res.found = True
+        res.path = [start]
+        res.stats.path_length = 1
+        return res
+
+    s = fg.index(start)
+    g = fg.index(goal)
+    gx, gy = goal
+    n = fg.size
+    parents = new_id_buffer(n)
+    parents[s] = s
+    g_score = new_id_buffer(n, INF)
+    g_score[s] = 0
+    visited = 1
+
+    open_heap: list[tuple[int, int, int]] = []
+    tie = 0
+    stale = 0
+    heapq.heappush(open_heap, (manhattan(start, goal), tie, s))
+
+    closed = bytearray(n)
+
+    order = res.visited_ids
+    nbs = fg.neighbor_ids
+    step = step_costs(fg)
+    push = heapq.heappush
+    pop = heapq.heappop
+
+    while open_heap:
+        _, _, current = pop(open_heap)
+        if closed[current]:
+            stale += 1
+            continue
+
+        order.append(current)
+
+        if current == g:
+            res.found = True
+            break
+
+        closed[current] = 1
+
+        base = g_score[current]
+        for nb in nbs(current):
+            if closed[nb]:
+                continue
+
+            tentative_g = base + step[nb]
+            old_g = g_score[nb]
+            if tentative_g < old_g:
+                if old_g == INF:
+                    visited += 1
+                parents[nb] = current
+                g_score[nb] = tentative_g
+                y, x = divmod(nb, w)
+                tie += 1
+                push(open_heap, (tentative_g + abs(x - gx) + abs(y - gy), tie, nb))
+
+    res.parents = parents
+    res.stats.expanded = len(order)
+    _count_queue_ops(res.stats, tie + 1, stale)
+    res.stats.visited = visited
+    if res.found:
+        res.path = reconstruct_path_ids(parents, s, g, w)
+        res.stats.path_length = len(res.path)
+    return res
+
+
+def _run_bucket_quiet(grid: Grid, start: Pos, goal: Pos, lifo: bool) -> SearchResult:
+    # _run_ids_quiet on a BucketQueue: Manhattan f-values are small ints that never go
+    # down, so O(1) buckets replace heapq
+    fg = as_flat(grid)
+    w = fg.width
+
+    res = new_result(start, goal)
+
+    if start == goal:
+        res.found = True
+        res.path = [start]
+        res.stats.path_length = 1
+        return res
+
+    s = fg.index(start)
+    g = fg.index(goal)
+    gx, gy = goal
+    n = fg.size
+    parents = new_id_buffer(n)
+    parents[s] = s
+    g_score = new_id_buffer(n, INF)
+    g_score[s] = 0
+    visited = 1
+
+    queue = BucketQueue(lifo)
+    queue.push(s, manhattan(start, goal))
+    pushes = 1
+    stale = 0
+
+    closed = bytearray(n)
+
+    order = res.visited_ids
+    nbs = fg.neighbor_ids
+    step = step_costs(fg)
+    push = queue.push
+    pop = queue.pop
+
+    while queue:
+        current = pop()[1]
+        if closed[current]:
+            stale += 1
+            continue
+
+        order.append(current)
+
+        if current == g:
+            res.found = True
+            break
+
+        closed[current] = 1
+
+        base = g_score[current]
+        for nb in nbs(current):
+            if closed[nb]:
+                continue
+
+            tentative_g = base + step[nb]
+            old_g = g_score[nb]
+            if tentative_g < old_g:
+                if old_g == INF:
+                    visited += 1
+                parents[nb] = current
+                g_score[nb] = tentative_g
+                y, x = divmod(nb, w)
+                push(nb, tentative_g + abs(x - gx) + abs(y - gy))
+                pushes += 1
+
+    res.parents = parents
+    res.stats.expanded = len(order)
+    _count_queue_ops(res.stats, pushes, stale)
+    res.stats.visited = visited
+    if res.found:
+        res.path = reconstruct_path_ids(parents, s, g, w)
+        res.stats.path_length = len(res.path)
+    return res
+
+
+def _run_configured(grid: Grid, start: Pos, goal: Pos, cfg: AlgorithmConfig) -> SearchResult:
+    # Any heuristic / tie-break / weight / queue other than the defaults, or a grid with
+    # terrain costs. Runs on cell ids; compact=False also gets visited_order / came_from.
+    fg = as_flat(grid)
+    res = new_result(start, goal)
+    events = _events_configured(fg, start, goal, res, cfg)
+    if not cfg.emit_trace:
+        drain(events)
+    else:
+        trace = new_trace(fg, "A*", start, goal)
+        collect_trace(events, trace)
+        finish_trace(res, cfg, trace)
+    if not cfg.compact:
+        fill_pos_form(res, fg.width)
+    return res
+
+
+def _events_configured(
+    fg: FlatGrid, start: Pos, goal: Pos, res: SearchResult, cfg: AlgorithmConfig
+) -> Iterator[tuple[int, int]]:
+    w = fg.width
+    s = fg.index(start)
+    g = fg.index(goal)
+    yield INIT, s
+
+    if start == goal:
+        res.found = True
+        res.path = [start]
+        res.stats.path_length = 1
+        yield GOAL_FOUND, g
+        yield PATH, -1
+        yield DONE, 1
+        return
+
+    heuristic = HEURISTICS[cfg.heuristic]
+    weight = cfg.weight
+    tie_break = cfg.tie_break
+    gx, gy = goal
+    n = fg.size
+    parents = new_id_buffer(n)
+    parents[s] = s
+    res.parents = parents
+    g_score = new_id_buffer(n, INF)
+    g_score[s] = 0
+    stats = res.stats
+    stats.visited = 1
+    step = step_costs(fg)
+
+    def key(i: int, g_i: int, tie: int) -> tuple:
+        y, x = divmod(i, w)
+        f = g_i + weight * heuristic(abs(x - gx), abs(y - gy))
+        if tie_break == "fifo":
+            return f, tie
+        if tie_break == "lifo":
+            return f, -tie
+        return f, -g_i, tie  # high_g: deeper nodes first, they are closer to the goal
+
+    heap = IndexedHeap(n) if cfg.queue == "indexed" else None
+    bucket = BucketQueue(lifo=tie_break == "lifo") if cfg.queue == "bucket" else None  # keyed by f alone
+    open_heap: list[tuple[tuple, int]] = []
+    tie = 0
+    k = key(s, 0, tie)
+    if heap is not None:
+        heap.push(s, k)
+    elif bucket is not None:
+        bucket.push(s, int(k[0]))
+    else:
+        open_heap.append((k, s))
+    stats.pushes = 1
+    yield FRONTIER_ADD, s
+
+    in_open = bytearray(n)
+    in_open[s] = 1
+    closed = bytearray(n)
+    order = res.visited_ids
+    nbs = fg.neighbor_ids
+    push = heapq.heappush
+    pop = heapq.heappop
+
+    while heap or bucket or open_heap:
+        if heap is not None:
+            current = heap.pop()[1]
+        elif bucket is not None:
+            current = bucket.pop()[1]
+        else:
+            current = pop(open_heap)[1]
+        stats.pops += 1
+        if closed[current]:
+            stats.stale_pops += 1
+            continue
+
+        in_open[current] = 0
+        yield FRONTIER_POP, current
+
+        order.append(current)
+        stats.expanded += 1
+        yield VISIT, current
+
+        if current == g:
+            res.found = True
+            yield GOAL_FOUND, g
+            break
+
+        closed[current] = 1
+
+        base = g_score[current]
+        for nb in nbs(current):
+            if closed[nb]:
+                continue
+
+            tentative_g = base + step[nb]
+            old_g = g_score[nb]
+            if tentative_g < old_g:
+                if old_g == INF:
+                    stats.visited += 1
+                parents[nb] = current
+                g_score[nb] = tentative_g
+                tie += 1
+                k = key(nb, tentative_g, tie)
+                if heap is not None:
+                    if heap.push(nb, k):
+                        stats.pushes += 1
+                else:
+                    if bucket is not None:
+                        bucket.push(nb, int(k[0]))
+                    else:
+                        push(open_heap, (k, nb))
+                    stats.pushes += 1
+                if not in_open[nb]:
+                    in_open[nb] = 1
+                    yield FRONTIER_ADD, nb
+
+    if res.found:
+        res.path = reconstruct_path_ids(parents, s, g, w)
+        stats.path_length = len(res.path)
+        yield PATH, -1
+
+    yield DONE, 1 if res.found else 0
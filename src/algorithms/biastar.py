@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import heapq
+from typing import Iterator
+
+from ..core.grid import FlatGrid, Grid, Pos
+from ..core.result import SearchResult
+from ..core.trace import BACKWARD, DONE, FRONTIER_ADD, FRONTIER_POP, GOAL_FOUND, INIT, PATH, VISIT
+from .common import (
+    AlgorithmConfig, SearchStepper, as_flat, collect_trace, drain, fill_pos_form, finish_trace, new_id_buffer,
+    new_result, new_trace, reconstruct_meet_path,
+)
+
+INF = 2**31 - 1
+
+
+def run(grid: Grid, start: Pos, goal: Pos, cfg: AlgorithmConfig | None = None) -> SearchResult:
+    cfg = cfg or AlgorithmConfig()
+    fg = as_flat(grid)
+    res = new_result(start, goal)
+    events = _events(fg, start, goal, res)
+    if not cfg.emit_trace:
+        drain(events)
+    else:
+        trace = new_trace(fg, "Bi-A*", start, goal)
+        collect_trace(events, trace)
+        finish_trace(res, cfg, trace)
+    if not cfg.compact:
+        fill_pos_form(res, fg.width)
+    return res
+
+
+def stream(grid: Grid, start: Pos, goal: Pos) -> SearchStepper:
+    fg = as_flat(grid)
+    res = new_result(start, goal)
+    return SearchStepper(_events(fg, start, goal, res), res, fg.width)
+
+
+def _events(fg: FlatGrid, start: Pos, goal: Pos, res: SearchResult) -> Iterator[tuple[int, int]]:
+    # Two A* searches (forward towards goal, backward towards start, both Manhattan) that
+    # alternate on the smaller open list. `best` is the shortest start..goal path seen via
+    # an edge between the two trees; since each side's lowest f bounds every path still
+    # undiscovered on that side, the search stops once best <= max(min f forward, min f backward).
+    w = fg.width
+    s = fg.index(start)
+    g = fg.index(goal)
+    yield INIT, s
+
+    if start == goal:
+        res.found = True
+        res.path = [start]
+        res.stats.path_length = 1
+        yield GOAL_FOUND, g
+        yield PATH, -1
+        yield DONE, 1
+        return
+
+    n = fg.size
+    g_score = (new_id_buffer(n, INF), new_id_buffer(n, INF))
+    parents = (new_id_buffer(n), new_id_buffer(n))
+    g_score[0][s] = 0
+    g_score[1][g] = 0
+    parents[0][s] = s
+    parents[1][g] = g
+    res.parents = parents[0]
+    closed = (bytearray(n), bytearray(n))
+    targets = (goal, start)
+
+    stats = res.stats
+    stats.visited = 2
+    order = res.visited_ids
+    nbs = fg.neighbor_ids
+    push = heapq.heappush
+    pop = heapq.heappop
+
+    h0 = abs(start[0] - goal[0]) + abs(start[1] - goal[1])
+    heaps: tuple[list[tuple[int, int, int]], list[tuple[int, int, int]]] = ([(h0, 0, s)], [(h0, 0, g)])
+    tie = 0
+    yield FRONTIER_ADD, s
+    yield FRONTIER_ADD | BACKWARD, g
+
+    best = INF
+    meet = (-1, -1)  # edge (a, b): a in the forward tree, b in the backward tree
+
+    while True:
+        # Drop entries for cells expanded since they were pushed
+        for side in (0, 1):
+            heap, done = heaps[side], closed[side]
+            while heap and done[heap[0][2]]:
+                pop(heap)
+        if not heaps[0] or not heaps[1]:
+            break
+        if best <= max(heaps[0][0][0], heaps[1][0][0]):
+            break
+
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        flag = BACKWARD if side else 0
+        heap = heaps[side]
+        g_me, g_other = g_score[side], g_score[1 - side]
+        p_me = parents[side]
+        done = closed[side]
+        tx, ty = targets[side]
+
+        _, _, cur = pop(heap)
+        done[cur] = 1
+        yield FRONTIER_POP | flag, cur
+        order.append(cur)
+        stats.expanded += 1
+        yield VISIT | flag, cur
+
+        ng = g_me[cur] + 1
+        for nb in nbs(cur):
+            if g_other[nb] < INF and ng + g_other[nb] < best:
+                best = ng + g_other[nb]
+                meet = (nb, cur) if side else (cur, nb)
+            if done[nb] or ng >= g_me[nb]:
+                continue
+            if g_me[nb] == INF:
+                if g_other[nb] == INF:
+                    stats.visited += 1
+                yield FRONTIER_ADD | flag, nb
+            g_me[nb] = ng
+            p_me[nb] = cur
+            y, x = divmod(nb, w)
+            tie += 1
+            push(heap, (ng + abs(x - tx) + abs(y - ty), tie, nb))
+
+    if best < INF:
+        res.found = True
+        a, b = meet
+        yield GOAL_FOUND, b
+        res.path = reconstruct_meet_path(parents[0], parents[1], s, g, a, b, w)
+        stats.path_length = len(res.path)
+        yield PATH, -1
+
+    yield DONE, 1 if res.found else 0
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from typing import Iterator
+
+from ..core.grid import FlatGrid, Grid, Pos
+from ..core.result import SearchResult
+from ..core.trace import BACKWARD, DONE, FRONTIER_ADD, FRONTIER_POP, GOAL_FOUND, INIT, PATH, VISIT
+from .common import (
+    AlgorithmConfig, SearchStepper, as_flat, collect_trace, drain, fill_pos_form, finish_trace, new_id_buffer,
+    new_result, new_trace, reconstruct_meet_path,
+)
+
+INF = 2**31 - 1
+
+
+def run(grid: Grid, start: Pos, goal: Pos, cfg: AlgorithmConfig | None = None) -> SearchResult:
+    cfg = cfg or AlgorithmConfig()
+    fg = as_flat(grid)
+    res = new_result(start, goal)
+    events = _events(fg, start, goal, res)
+    if not cfg.emit_trace:
+        drain(events)
+    else:
+        trace = new_trace(fg, "Bi-BFS", start, goal)
+        collect_trace(events, trace)
+        finish_trace(res, cfg, trace)
+    if not cfg.compact:
+        fill_pos_form(res, fg.width)
+    return res
+
+
+def stream(grid: Grid, start: Pos, goal: Pos) -> SearchStepper:
+    fg = as_flat(grid)
+    res = new_result(start, goal)
+    return SearchStepper(_events(fg, start, goal, res), res, fg.width)
+
+
+def _events(fg: FlatGrid, start: Pos, goal: Pos, res: SearchResult) -> Iterator[tuple[int, int]]:
+    # Level-synchronous BFS from both ends, always growing the smaller frontier by one
+    # whole layer. Every edge into the other side's tree is a candidate meeting point; the
+    # best candidate of the layer where the searches first touch is a shortest path.
+    s = fg.index(start)
+    g = fg.index(goal)
+    yield INIT, s
+
+    if start == goal:
+        res.found = True
+        res.path = [start]
+        res.stats.path_length = 1
+        yield GOAL_FOUND, g
+        yield PATH, -1
+        yield DONE, 1
+        return
+
+    n = fg.size
+    dist = (new_id_buffer(n), new_id_buffer(n))
+    parents = (new_id_buffer(n), new_id_buffer(n))
+    dist[0][s] = 0
+    dist[1][g] = 0
+    parents[0][s] = s
+    parents[1][g] = g
+    res.parents = parents[0]
+
+    stats = res.stats
+    stats.visited = 2
+    order = res.visited_ids
+    nbs = fg.neighbor_ids
+
+    fronts: list[list[int]] = [[s], [g]]
+    yield FRONTIER_ADD, s
+    yield FRONTIER_ADD | BACKWARD, g
+
+    best = INF
+    meet = (-1, -1)  # edge (a, b): a in the forward tree, b in the backward tree
+
+    while fronts[0] and fronts[1]:
+        side = 0 if len(fronts[0]) <= len(fronts[1]) else 1
+        flag = BACKWARD if side else 0
+        d_me, d_other = dist[side], dist[1 - side]
+        p_me = parents[side]
+
+        nxt: list[int] = []
+        for cur in fronts[side]:
+            yield FRONTIER_POP | flag, cur
+            order.append(cur)
+            stats.expanded += 1
+            yield VISIT | flag, cur
+
+            d = d_me[cur] + 1
+            for nb in nbs(cur):
+                if d_other[nb] >= 0 and d + d_other[nb] < best:
+                    best = d + d_other[nb]
+                    meet = (nb, cur) if side else (cur, nb)
+                if d_me[nb] < 0:
+                    d_me[nb] = d
+                    p_me[nb] = cur
+                    if d_other[nb] < 0:
+                        stats.visited += 1
+                    nxt.append(nb)
+                    yield FRONTIER_ADD | flag, nb
+        fronts[side] = nxt
+
+        if best < INF:
+            res.found = True
+            yield GOAL_FOUND, meet[1]
+            break
+
+    if res.found:
+        a, b = meet
+        res.path = reconstruct_meet_path(parents[0], parents[1], s, g, a, b, fg.width)
+        stats.path_length = len(res.path)
+        yield PATH, -1
+
+    yield DONE, 1 if res.found else 0
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import hashlib
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterator
+
+from ..core.grid import FlatGrid, Grid, Pos
+from ..core.result import SearchResult
+from ..core.trace import DONE, PackedTrace
+from .common import AlgorithmConfig, SearchStepper
+from .registry import get_run, get_stream
+
+# Memoized searches. Entries are keyed by the grid *contents* (so a regenerated identical
+# maze still hits) plus (algorithm, start, goal, config). Grids memoize their
+# fingerprint per version (derived()), so unchanged grids are hashed once and any
+# set_wall()/set_cost() makes the next lookup rehash, which can never match a stale entry.
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+_POS_BYTES = sys.getsizeof((0, 0)) + 2 * sys.getsizeof(1 << 20)  # tuple + two (non-cached) ints
+_EVENT_BYTES = sys.getsizeof(("visit", (0, 0))) + _POS_BYTES  # one event of a tuple trace
+_DICT_ITEM_BYTES = 3 * 8 + 2 * _POS_BYTES  # came_from entry: hash slot + key/value tuples
+
+CacheKey = tuple[bytes, str, Pos, Pos, AlgorithmConfig]
+
+# What stream() records and replays: the packed trace
+REPLAY_CFG = AlgorithmConfig(emit_trace=True, packed_trace=True)
+
+
+@dataclass(frozen=True)
+class CacheInfo:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    nbytes: int
+
+
+def grid_fingerprint(grid: Grid) -> bytes:
+    if isinstance(grid, FlatGrid):
+        return grid.derived("fingerprint", _fingerprint_flat)
+    return grid.derived("fingerprint", _fingerprint_rows)
+
+
+def _fingerprint_rows(grid: Grid) -> bytes:
+    rows = b"".join(bytes(row) for row in grid.walls)
+    return _digest(grid.width, grid.height, rows, grid.costs)
+
+
+class _CostDigest(bytes):
+    # The fingerprint covers the costs too: dropped on cost edits as well as wall edits
+    def cost_changed(self, i: int) -> bool:
+        return False
+
+
+def _fingerprint_flat(grid: FlatGrid) -> bytes:
+    return _CostDigest(_digest(grid.width, grid.height, grid.cells, grid.costs))
+
+
+def _digest(width: int, height: int, cells: bytes | bytearray, costs: bytearray | None = None) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(width.to_bytes(4, "little") + height.to_bytes(4, "little"))
+    h.update(cells)
+    if costs is not None:
+        h.update(costs)
+    return h.digest()
+
+
+def result_nbytes(res: SearchResult) -> int:
+    # Rough retained size of a result; good enough to keep the cache under its budget
+    n = sys.getsizeof(res) + sys.getsizeof(res.path) + len(res.path) * _POS_BYTES
+    n += sys.getsizeof(res.visited_order) + len(res.visited_order) * _POS_BYTES
+    n += sys.getsizeof(res.came_from) + len(res.came_from) * _DICT_ITEM_BYTES
+    n += res.visited_ids.itemsize * len(res.visited_ids)
+    if res.parents is not None:
+        n += res.parents.itemsize * len(res.parents)
+    if isinstance(res.trace, PackedTrace):
+        n += res.trace.nbytes()
+    else:
+        n += sys.getsizeof(res.trace) + len(res.trace) * _EVENT_BYTES
+    return n
+
+
+class PathCache:
+    # LRU over search results, bounded by entry count and by estimated bytes.
+    # Cached SearchResults are shared between callers: treat them as read-only.
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+        self._entries: OrderedDict[CacheKey, tuple[SearchResult, int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, algo: str, grid: Grid, start: Pos, goal: Pos, cfg: AlgorithmConfig) -> CacheKey:
+        return grid_fingerprint(grid), algo, start, goal, cfg
+
+    def search(self, algo: str, grid: Grid, start: Pos, goal: Pos, cfg: AlgorithmConfig | None = None) -> SearchResult:
+        # `algo` is a registry name ("bfs", "astar", ...)
+        cfg = cfg or AlgorithmConfig()
+        key = self.key(algo, grid, start, goal, cfg)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        res = get_run(algo)(grid, start, goal, cfg)
+        self.put(key, res)
+        return res
+
+    def stream(self, algo: str, grid: Grid, start: Pos, goal: Pos) -> SearchStepper:
+        # Incremental search(..., REPLAY_CFG). A hit replays the cached trace; a miss
+        # streams the search itself, so playback starts right away and nothing is held
+        # beyond the trace being recorded, and caches the result once it is done.
+        # An aborted search is not cached.
+        key = self.key(algo, grid, start, goal, REPLAY_CFG)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            res = entry[0]
+            return SearchStepper(iter(res.trace), res, grid.width)
+
+        self.misses += 1
+        search = get_stream(algo)(grid, start, goal)
+        trace = PackedTrace(width=grid.width, algo=algo, start=start, goal=goal)
+        return SearchStepper(self._record(key, search, trace), search.result, grid.width)
+
+    def _record(self, key: CacheKey, search: SearchStepper, trace: PackedTrace) -> Iterator[tuple[int, int]]:
+        code = trace.codes.append
+        cell = trace.cells.append
+        try:
+            for c, i in search:
+                code(c)
+                cell(i)
+                if c == DONE:
+                    # Last event: the result is final. Cached now, since the player
+                    # stops pulling once it has seen DONE.
+                    res = search.result
+                    trace.path = res.path
+                    res.trace = trace
+                    self.put(key, res)
+                yield c, i
+        finally:
+            search.abort()
+
+    def put(self, key: CacheKey, res: SearchResult) -> None:
+        size = result_nbytes(res)
+        if size > self.max_bytes:
+            return  # would evict everything else and still not fit
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.nbytes -= old[1]
+        self._entries[key] = (res, size)
+        self.nbytes += size
+        while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+            _, (_, dropped) = self._entries.popitem(last=False)
+            self.nbytes -= dropped
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.nbytes = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.evictions, len(self._entries), self.nbytes)
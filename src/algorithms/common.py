@@ -1,15 +1,68 @@
 from __future__ import annotations
 
+import math
+from array import array
 from dataclasses import dataclass
-from typing import Callable, Iterable
+from itertools import islice
+from typing import Callable, Iterable, Iterator
 
-from ..core.grid import Grid, Pos
+from ..core.grid import FlatGrid, Grid, Pos
 from ..core.result import SearchResult
+from ..core.trace import DONE, LEVEL, PackedTrace
+
+
+_SQRT2_M1 = math.sqrt(2) - 1
+
+# Estimate of the remaining cost from the offset (dx, dy) >= 0 to the goal. Octile and
+# euclidean are the admissible ones for 8-connected moves; on the 4-connected grid they
+# still never overestimate, they are just weaker than manhattan.
+HEURISTICS: dict[str, Callable[[int, int], float]] = {
+    "manhattan": lambda dx, dy: dx + dy,
+    "octile": lambda dx, dy: max(dx, dy) + _SQRT2_M1 * min(dx, dy),
+    "euclidean": lambda dx, dy: math.hypot(dx, dy),
+    "zero": lambda dx, dy: 0,  # uniform-cost search
+}
+
+# Order among open nodes with equal f: insertion order, newest first, or deepest first
+TIE_BREAKS = ("fifo", "lifo", "high_g")
+
+# Open list: heapq with stale duplicates skipped on pop, an IndexedHeap (decrease-key),
+# or a BucketQueue (integer f-values only)
+QUEUES = ("heap", "indexed", "bucket")
 
 
 @dataclass(frozen=True)
 class AlgorithmConfig:
     emit_trace: bool = True
+    compact: bool = False  # integer cell ids + array buffers instead of Pos dicts/sets
+    packed_trace: bool = False  # keep res.trace as a PackedTrace (implies compact)
+
+    # A* only: f = g + weight * heuristic; weight > 1 trades optimality for speed
+    heuristic: str = "manhattan"
+    tie_break: str = "fifo"
+    weight: float = 1.0
+    queue: str = "heap"
+
+    def __post_init__(self) -> None:
+        if self.heuristic not in HEURISTICS:
+            raise ValueError(f"unknown heuristic {self.heuristic!r} (expected one of {', '.join(HEURISTICS)})")
+        if self.tie_break not in TIE_BREAKS:
+            raise ValueError(f"unknown tie_break {self.tie_break!r} (expected one of {', '.join(TIE_BREAKS)})")
+        if self.queue not in QUEUES:
+            raise ValueError(f"unknown queue {self.queue!r} (expected one of {', '.join(QUEUES)})")
+        if self.weight < 0:
+            raise ValueError("weight must be >= 0")
+        if self.queue == "bucket":
+            # Bucket keys are ints that never go down: integer, consistent f-values only
+            if self.heuristic not in ("manhattan", "zero") or self.weight not in (0.0, 1.0):
+                raise ValueError("the bucket queue needs the manhattan or zero heuristic with weight 1 (or 0)")
+            if self.tie_break == "high_g":
+                raise ValueError("the bucket queue breaks ties fifo or lifo only")
+
+    @property
+    def default_search(self) -> bool:
+        # Plain A*: the tuned code paths apply
+        return (self.heuristic, self.tie_break, self.weight, self.queue) == ("manhattan", "fifo", 1.0, "heap")
 
 
 def manhattan(a: Pos, b: Pos) -> int:
@@ -30,12 +83,274 @@ def reconstruct_path(came_from: dict[Pos, Pos | None], start: Pos, goal: Pos) ->
     return path
 
 
+def reconstruct_path_ids(parents: array, start: int, goal: int, width: int) -> list[Pos]:
+    if parents[goal] < 0:
+        return []
+    path: list[Pos] = []
+    cur = goal
+    while True:
+        y, x = divmod(cur, width)
+        path.append((x, y))
+        if cur == start:
+            break
+        cur = parents[cur]
+    path.reverse()
+    return path
+
+
+def fill_pos_form(res: SearchResult, width: int) -> None:
+    # visited_order / came_from from a compact result (visited_ids / parents), for
+    # callers that asked for compact=False from a search that only runs on cell ids
+    def pos(i: int) -> Pos:
+        y, x = divmod(i, width)
+        return x, y
+
+    res.visited_order = [pos(i) for i in res.visited_ids]
+    came_from: dict[Pos, Pos | None] = {res.start: None}
+    parents = res.parents
+    if parents is not None:
+        for i, p in enumerate(parents):
+            if p >= 0 and p != i:
+                came_from[pos(i)] = pos(p)
+    # The path itself always links back: bidirectional searches only keep the forward
+    # tree, and some searches keep no parent array at all
+    for a, b in zip(res.path, res.path[1:]):
+        came_from[b] = a
+    res.came_from = came_from
+
+
+def reconstruct_meet_path(
+    parents_f: array, parents_b: array, start: int, goal: int, a: int, b: int, width: int
+) -> list[Pos]:
+    # Bidirectional searches: start..a from the forward tree, then b..goal from the backward one
+    path = reconstruct_path_ids(parents_f, start, a, width)
+    cur = b
+    while True:
+        y, x = divmod(cur, width)
+        path.append((x, y))
+        if cur == goal:
+            break
+        cur = parents_b[cur]
+    return path
+
+
+def as_flat(grid: Grid) -> FlatGrid:
+    return grid if isinstance(grid, FlatGrid) else FlatGrid.from_grid(grid)
+
+
+def new_id_buffer(n: int, fill: int = -1) -> array:
+    return array("i", [fill]) * n
+
+
+def step_costs(fg: FlatGrid) -> bytes | bytearray:
+    # Cost of stepping onto each cell: the terrain layer, or all ones. Lets one search
+    # loop add step[nb] for both kinds of grid instead of branching per neighbor.
+    return fg.costs if fg.costs is not None else b"\x01" * fg.size
+
+
+def drain(events: Iterator[tuple[int, int]]) -> None:
+    for _ in events:
+        pass
+
+
 def new_result(start: Pos, goal: Pos) -> SearchResult:
     r = SearchResult(found=False, start=start, goal=goal)
     r.came_from[start] = None
     return r
 
 
+def new_trace(fg: FlatGrid, algo: str, start: Pos, goal: Pos) -> PackedTrace:
+    return PackedTrace(width=fg.width, algo=algo, start=start, goal=goal)
+
+
+def finish_trace(res: SearchResult, cfg: AlgorithmConfig, trace: PackedTrace) -> None:
+    trace.path = res.path
+    res.trace = trace if cfg.packed_trace else list(trace.events())
+
+
+def collect_trace(events: Iterator[tuple[int, int]], trace: PackedTrace) -> None:
+    code = trace.codes.append
+    cell = trace.cells.append
+    for c, i in events:
+        code(c)
+        cell(i)
+
+
+class SearchStepper:
+    # Incremental search: pulls packed (code, cell) events on demand, so nothing is
+    # buffered and the caller can stop at any point. `result` fills in as it runs.
+
+    def __init__(self, events: Iterator[tuple[int, int]], result: SearchResult, width: int) -> None:
+        self.result = result
+        self.width = width
+        self.done = False
+        self._events = events
+
+    def step(self, n: int = 1) -> list[tuple[int, int]]:
+        if self.done:
+            return []
+        out = list(islice(self._events, n))
+        if len(out) < n or (out and out[-1][0] == DONE):
+            self.done = True
+        return out
+
+    def step_level(self) -> list[tuple[int, int]]:
+        # Events up to and including the next LEVEL marker: one whole wavefront of a
+        # level-synchronous search (other searches have no markers and run to the end)
+        out: list[tuple[int, int]] = []
+        while not self.done:
+            batch = self.step(1)
+            out += batch
+            if batch and batch[0][0] == LEVEL:
+                break
+        return out
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        while not self.done:
+            batch = self.step(1024)
+            yield from batch
+
+    def run(self) -> SearchResult:
+        for _ in self:
+            pass
+        return self.result
+
+    def abort(self) -> None:
+        close = getattr(self._events, "close", None)  # plain iterators (trace replay) have none
+        if close is not None:
+            close()
+        self.done = True
+
+    def pos(self, cell: int) -> Pos:
+        y, x = divmod(cell, self.width)
+        return x, y
+
+
+class IndexedHeap:
+    # Binary min-heap of cell ids with decrease-key. Every id is in the heap at most once
+    # (`_index[id]` = its slot, -1 = absent), so pops never return stale entries.
+
+    def __init__(self, n: int) -> None:
+        self._heap: list[tuple[tuple, int]] = []  # (key, id)
+        self._index = new_id_buffer(n)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, item: int) -> bool:
+        return self._index[item] >= 0
+
+    def push(self, item: int, key: tuple) -> bool:
+        # Inserts item, or lowers its key if it is already queued with a higher one.
+        # Returns True for an insert.
+        i = self._index[item]
+        if i < 0:
+            self._heap.append((key, item))
+            self._up(len(self._heap) - 1)
+            return True
+        if key < self._heap[i][0]:
+            self._heap[i] = (key, item)
+            self._up(i)
+        return False
+
+    def pop(self) -> tuple[tuple, int]:
+        heap = self._heap
+        top = heap[0]
+        last = heap.pop()
+        self._index[top[1]] = -1
+        if heap:
+            heap[0] = last
+            self._down(0)
+        return top
+
+    def _up(self, i: int) -> None:
+        heap, index = self._heap, self._index
+        entry = heap[i]
+        while i:
+            parent = (i - 1) >> 1
+            above = heap[parent]
+            if entry[0] >= above[0]:
+                break
+            heap[i] = above
+            index[above[1]] = i
+            i = parent
+        heap[i] = entry
+        index[entry[1]] = i
+
+    def _down(self, i: int) -> None:
+        heap, index = self._heap, self._index
+        n = len(heap)
+        entry = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and heap[child + 1][0] < heap[child][0]:
+                child += 1
+            below = heap[child]
+            if below[0] >= entry[0]:
+                break
+            heap[i] = below
+            index[below[1]] = i
+            i = child
+        heap[i] = entry
+        index[entry[1]] = i
+
+
+class BucketQueue:
+    # Dial's monotone bucket queue: one bucket per integer key and a cursor that only moves
+    # forward, so push and pop are O(1) (plus the empty buckets the cursor skips). Keys
+    # must be non-negative ints, and never below the last key popped - true for
+    # Dijkstra with non-negative integer costs and for A* with a consistent integer
+    # heuristic. Equal keys pop oldest first (lifo=True: newest first).
+
+    def __init__(self, lifo: bool = False) -> None:
+        self._buckets: list[list[int]] = [[]]
+        self._cur = 0  # key of the bucket being drained
+        self._head = 0  # FIFO read position in that bucket
+        self._size = 0
+        self._lifo = lifo
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, item: int, key: int) -> None:
+        if key < self._cur:
+            raise ValueError(f"key {key} is below the current minimum {self._cur} (bucket queues are monotone)")
+        try:
+            self._buckets[key].append(item)
+        except IndexError:
+            self._buckets.extend([] for _ in range(key + 1 - len(self._buckets)))
+            self._buckets[key].append(item)
+        self._size += 1
+
+    def pop(self) -> tuple[int, int]:
+        # (key, item) with the smallest key
+        if not self._size:
+            raise IndexError("pop from an empty BucketQueue")
+        self._size -= 1
+        k = self._cur
+        bucket = self._buckets[k]
+        if self._lifo:
+            while not bucket:
+                k += 1
+                bucket = self._buckets[k]
+            self._cur = k
+            return k, bucket.pop()
+        head = self._head
+        if head < len(bucket):
+            self._head = head + 1
+            return k, bucket[head]
+        while True:
+            bucket.clear()  # drained, the cursor never comes back
+            k += 1
+            bucket = self._buckets[k]
+            if bucket:
+                self._cur = k
+                self._head = 1
+                return k, bucket[0]
+
+
 def emit(res: SearchResult, cfg: AlgorithmConfig, event: str, payload=None) -> None:
     if cfg.emit_trace:
         res.trace.append((event, payload))
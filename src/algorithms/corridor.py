@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import heapq
+from array import array
+from collections import deque
+from typing import Iterator
+
+from ..core.grid import FlatGrid, Grid, Pos
+from ..core.result import SearchResult
+from ..core.trace import DONE, FRONTIER_ADD, FRONTIER_POP, GOAL_FOUND, INIT, PATH, VISIT
+from .common import (
+    AlgorithmConfig, SearchStepper, as_flat, collect_trace, drain, fill_pos_form, finish_trace, new_id_buffer,
+    new_result, new_trace,
+)
+
+# A* on a maze reduced to its junctions.
+#
+# Dead ends are peeled off first: cells with at most one open neighbor are removed until
+# none are left, and each removed cell remembers the neighbor it hung from (`up`), so
+# every dead-end subtree is a tree of up-pointers ending on the remaining core (or, for
+# a component with no cycle at all, on its last peeled cell). In the core every cell has
+# two or more neighbors; cells with three or more are junctions, and the runs of
+# two-neighbor cells between them become corridors: one weighted edge per corridor.
+# A query climbs from start and goal to the core, searches the junction graph (exact:
+# a dead-end subtree only connects through the cell it hangs from) and expands the
+# corridors back into cells for the result.
+
+# Edge: (node, cost, corridor, lo, hi, reverse) - the cells walked between the two nodes
+# are corridor[lo:hi], reversed if `reverse`
+Edge = tuple[int, int, int, int, int, bool]
+
+
+def run(grid: Grid, start: Pos, goal: Pos, cfg: AlgorithmConfig | None = None) -> SearchResult:
+    cfg = cfg or AlgorithmConfig()
+    fg = as_flat(grid)
+    res = new_result(start, goal)
+    events = _events(reduced(fg), start, goal, res)
+    if not cfg.emit_trace:
+        drain(events)
+    else:
+        trace = new_trace(fg, "Corridor A*", start, goal)
+        collect_trace(events, trace)
+        finish_trace(res, cfg, trace)
+    if not cfg.compact:
+        fill_pos_form(res, fg.width)
+    return res
+
+
+def stream(grid: Grid, start: Pos, goal: Pos) -> SearchStepper:
+    fg = as_flat(grid)
+    res = new_result(start, goal)
+    return SearchStepper(_events(reduced(fg), start, goal, res), res, fg.width)
+
+
+def reduced(fg: FlatGrid) -> CorridorGraph:
+    # Built on first use and cached on the grid until a wall changes
+    return fg.derived("corridors", CorridorGraph)
+
+
+class CorridorGraph:
+    def __init__(self, grid: FlatGrid) -> None:
+        self.grid = grid
+        n = grid.size
+        self.up = new_id_buffer(n)  # pruned cell -> the cell it hangs from (-1 = tree root)
+        self.pruned = bytearray(n)
+        self.corridor_of = new_id_buffer(n)  # core cell inside a corridor -> corridor id
+        self.offset = new_id_buffer(n)  # ... and its index in that corridor
+        self.corridors: list[array] = []  # interior cells, from the `ends[c][0]` side
+        self.ends: list[tuple[int, int]] = []
+        self.edges: dict[int, list[Edge]] = {}  # junction -> edges to other junctions
+        self._core_degree = self._peel()
+        self._link()
+
+    def _peel(self) -> array:
+        grid = self.grid
+        cells = grid.cells
+        offsets, targets = grid.adjacency()
+        degree = array("i", [offsets[i + 1] - offsets[i] for i in range(grid.size)])
+        pruned = self.pruned
+        up = self.up
+        q = deque(i for i in range(grid.size) if not cells[i] and degree[i] <= 1)
+        while q:
+            i = q.popleft()
+            pruned[i] = 1
+            for nb in targets[offsets[i]:offsets[i + 1]]:
+                if not pruned[nb]:
+                    up[i] = nb
+                    degree[nb] -= 1
+                    if degree[nb] == 1:
+                        q.append(nb)
+        return degree
+
+    def _link(self) -> None:
+        grid = self.grid
+        cells = grid.cells
+        degree = self._core_degree
+        pruned = self.pruned
+        core = [i for i in range(grid.size) if not cells[i] and not pruned[i]]
+        for i in core:
+            if degree[i] >= 3:
+                self.edges[i] = []
+        for a in list(self.edges):
+            self._walk_from(a)
+        # Whatever is left are loops without a junction: any cell on one can be the node
+        for i in core:
+            if i not in self.edges and self.corridor_of[i] < 0:
+                self.edges[i] = []
+                self._walk_from(i)
+
+    def _core_neighbors(self, i: int) -> list[int]:
+        pruned = self.pruned
+        return [nb for nb in self.grid.neighbor_ids(i) if not pruned[nb]]
+
+    def _walk_from(self, a: int) -> None:
+        edges = self.edges
+        for first in self._core_neighbors(a):
+            if first in edges:
+                if a < first:  # adjacent junctions, no cells in between
+                    self._add_corridor(a, first, array("i"))
+                continue
+            if self.corridor_of[first] >= 0:
+                continue  # walked from the other end already
+            interior = array("i")
+            prev, cur = a, first
+            while cur not in edges:
+                interior.append(cur)
+                # Corridor cells have exactly two core neighbors: keep going away from prev
+                nxt = [nb for nb in self._core_neighbors(cur) if nb != prev]
+                prev, cur = cur, nxt[0]
+            self._add_corridor(a, cur, interior)
+
+    def _add_corridor(self, a: int, b: int, interior: array) -> None:
+        cid = len(self.corridors)
+        self.corridors.append(interior)
+        self.ends.append((a, b))
+        for k, i in enumerate(interior):
+            self.corridor_of[i] = cid
+            self.offset[i] = k
+        if a != b:
+            cost = len(interior) + 1
+            self.edges[a].append((b, cost, cid, 0, len(interior), False))
+            self.edges[b].append((a, cost, cid, 0, len(interior), True))
+
+    # -- queries --
+
+    def climb(self, i: int) -> list[int]:
+        # i, then up-pointers until the core (last item) or the root of a dead-end tree
+        out = [i]
+        up = self.up
+        pruned = self.pruned
+        while pruned[i] and up[i] >= 0:
+            i = up[i]
+            out.append(i)
+        return out
+
+    def exits(self, i: int) -> list[Edge]:
+        # Edges out of a core cell: its own if it is a junction, else to both corridor ends
+        if i in self.edges:
+            return self.edges[i]
+        cid = self.corridor_of[i]
+        k = self.offset[i]
+        a, b = self.ends[cid]
+        size = len(self.corridors[cid])
+        return [(a, k + 1, cid, 0, k, True), (b, size - k, cid, k + 1, size, False)]
+
+    def entries(self, i: int) -> dict[int, list[Edge]]:
+        # Reverse of exits(): junction -> edges from it into core cell i
+        if i in self.edges:
+            return {}
+        cid = self.corridor_of[i]
+        k = self.offset[i]
+        a, b = self.ends[cid]
+        size = len(self.corridors[cid])
+        out: dict[int, list[Edge]] = {}
+        out.setdefault(a, []).append((i, k + 1, cid, 0, k, False))
+        out.setdefault(b, []).append((i, size - k, cid, k + 1, size, True))
+        return out
+
+    def cells(self, e: Edge) -> list[int]:
+        _, _, cid, lo, hi, rev = e
+        part = self.corridors[cid][lo:hi].tolist()
+        if rev:
+            part.reverse()
+        return part
+
+    def size(self) -> tuple[int, int]:
+        # (junctions, directed edges) of the reduced graph
+        return len(self.edges), sum(len(v) for v in self.edges.values())
+
+
+def _events(cg: CorridorGraph, start: Pos, goal: Pos, res: SearchResult) -> Iterator[tuple[int, int]]:
+    fg = cg.grid
+    w = fg.width
+    s = fg.index(start)
+    g = fg.index(goal)
+    yield INIT, s
+
+    stats = res.stats
+    if fg.cells[s] or fg.cells[g]:
+        yield DONE, 0
+        return
+
+    # Out of the dead ends: start and goal climb to the core unless they meet on the way
+    up_s, up_g = cg.climb(s), cg.climb(g)
+    on_g = {c: k for k, c in enumerate(up_g)}
+    for k, c in enumerate(up_s):
+        if c in on_g:
+            cells = up_s[:k] + up_g[on_g[c]::-1]
+            res.found = True
+            res.path = [(i % w, i // w) for i in cells]
+            stats.path_length = len(res.path)
+            yield GOAL_FOUND, g
+            yield PATH, -1
+            yield DONE, 1
+            return
+    cs, ct = up_s[-1], up_g[-1]
+    if cg.pruned[cs] or cg.pruned[ct]:
+        yield DONE, 0  # a cycle-free component that doesn't hold both
+        return
+
+    from_start = cg.exits(cs)
+    to_goal = cg.entries(ct)
+    if cs not in cg.edges and cg.corridor_of[cs] == cg.corridor_of[ct]:
+        # Both in one corridor: walking straight along it competes with going round
+        cid = cg.corridor_of[cs]
+        i, j = cg.offset[cs], cg.offset[ct]
+        lo, hi = (i + 1, j) if i < j else (j + 1, i)
+        from_start = from_start + [(ct, abs(i - j), cid, lo, hi, i > j)]
+
+    g_score = {cs: 0}
+    via: dict[int, tuple[int, Edge | None]] = {cs: (cs, None)}
+    closed: set[int] = set()
+    gx, gy = goal
+    open_heap = [(abs(cs % w - gx) + abs(cs // w - gy), 0, cs)]
+    tie = 0
+    stats.visited = 1
+    yield FRONTIER_ADD, cs
+
+    while open_heap:
+        _, _, cur = heapq.heappop(open_heap)
+        if cur in closed:
+            continue
+        closed.add(cur)
+        yield FRONTIER_POP, cur
+        res.visited_ids.append(cur)
+        stats.expanded += 1
+        yield VISIT, cur
+        if cur == ct:
+            break
+
+        edges = from_start if cur == cs else cg.edges[cur]
+        if cur in to_goal:
+            edges = edges + to_goal[cur]
+
+        base = g_score[cur]
+        for e in edges:
+            nb = e[0]
+            ng = base + e[1]
+            if nb in closed or ng >= g_score.get(nb, ng + 1):
+                continue
+            if nb not in g_score:
+                stats.visited += 1
+                yield FRONTIER_ADD, nb
+            g_score[nb] = ng
+            via[nb] = (cur, e)
+            y, x = divmod(nb, w)
+            tie += 1
+            heapq.heappush(open_heap, (ng + abs(x - gx) + abs(y - gy), tie, nb))
+
+    if ct in closed:
+        res.found = True
+        yield GOAL_FOUND, g
+        # Core part backwards: each hop contributes its corridor cells, then its start node
+        core: list[int] = [ct]
+        cur = ct
+        while cur != cs:
+            prev, e = via[cur]
+            core += reversed(cg.cells(e))  # type: ignore[arg-type]
+            core.append(prev)
+            cur = prev
+        core.reverse()
+        cells = up_s[:-1] + core + up_g[-2::-1]
+        res.path = [(i % w, i // w) for i in cells]
+        stats.path_length = len(res.path)
+        yield PATH, -1
+
+    yield DONE, 1 if res.found else 0
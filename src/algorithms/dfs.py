@@ -1,12 +1,24 @@
 from __future__ import annotations
 
-from ..core.grid import Grid, Pos
+from typing import Iterator
+
+from ..core.grid import FlatGrid, Grid, Pos
 from ..core.result import SearchResult
-from .common import AlgorithmConfig, emit, neighbors4, new_result, reconstruct_path
+from ..core.trace import DONE, FRONTIER_ADD, FRONTIER_POP, GOAL_FOUND, INIT, PATH, VISIT
+from .common import (
+    AlgorithmConfig, SearchStepper, as_flat, collect_trace, emit, finish_trace, neighbors4,
+    new_id_buffer, new_result, new_trace, reconstruct_path, reconstruct_path_ids,
+)
 
 
 def run(grid: Grid, start: Pos, goal: Pos, cfg: AlgorithmConfig | None = None) -> SearchResult:
     cfg = cfg or AlgorithmConfig()
+    if cfg.compact or cfg.packed_trace:
+        if not cfg.emit_trace:
+            return _run_ids_quiet(grid, start, goal)
+        return _run_ids(grid, start, goal, cfg)
+    if not cfg.emit_trace:
+        return _run_quiet(grid, start, goal)
 
     res = new_result(start, goal)
     emit(res, cfg, "init", {"algo": "DFS", "start": start, "goal": goal})
@@ -54,3 +66,160 @@ def run(grid: Grid, start: Pos, goal: Pos, cfg: AlgorithmConfig | None = None) -
 
     emit(res, cfg, "done", {"found": res.found})
     return res
+
+
+def _run_quiet(grid: Grid, start: Pos, goal: Pos) -> SearchResult:
+    # Same search as run() with every trace call stripped out of the loop
+    res = new_result(start, goal)
+
+    if start == goal:
+        res.found = True
+        res.path = [start]
+        res.stats.path_length = 1
+        return res
+
+    stack: list[Pos] = [start]
+
+    visited: set[Pos] = {start}
+    came_from = res.came_from
+    order = res.visited_order
+    nbs = grid.neighbors4
+
+    while stack:
+        current = stack.pop()
+        order.append(current)
+
+        if current == goal:
+            res.found = True
+            break
+
+        for nb in nbs(current):
+            if nb in visited:
+                continue
+            visited.add(nb)
+            came_from[nb] = current
+            stack.append(nb)
+
+    res.stats.expanded = len(order)
+    res.stats.visited = len(visited)
+    if res.found:
+        res.path = reconstruct_path(came_from, start, goal)
+        res.stats.path_length = len(res.path)
+    return res
+
+
+def stream(grid: Grid, start: Pos, goal: Pos) -> SearchStepper:
+    fg = as_flat(grid)
+    res = new_result(start, goal)
+    return SearchStepper(_events(fg, start, goal, res), res, fg.width)
+
+
+def _run_ids(grid: Grid, start: Pos, goal: Pos, cfg: AlgorithmConfig) -> SearchResult:
+    fg = as_flat(grid)
+    res = new_result(start, goal)
+    trace = new_trace(fg, "DFS", start, goal)
+    collect_trace(_events(fg, start, goal, res), trace)
+    finish_trace(res, cfg, trace)
+    return res
+
+
+def _events(fg: FlatGrid, start: Pos, goal: Pos, res: SearchResult) -> Iterator[tuple[int, int]]:
+    s = fg.index(start)
+    g = fg.index(goal)
+    yield INIT, s
+
+    if start == goal:
+        res.found = True
+        res.path = [start]
+        res.stats.path_length = 1
+        yield GOAL_FOUND, g
+        yield PATH, -1
+        yield DONE, 1
+        return
+
+    parents = new_id_buffer(fg.size)
+    parents[s] = s
+    res.parents = parents
+    stats = res.stats
+    stats.visited = 1
+
+    stack: list[int] = [s]
+    yield FRONTIER_ADD, s
+
+    order = res.visited_ids
+    nbs = fg.neighbor_ids
+
+    while stack:
+        current = stack.pop()
+        yield FRONTIER_POP, current
+
+        order.append(current)
+        stats.expanded += 1
+        yield VISIT, current
+
+        if current == g:
+            res.found = True
+            yield GOAL_FOUND, g
+            break
+
+        for nb in nbs(current):
+            if parents[nb] >= 0:
+                continue
+            parents[nb] = current
+            stats.visited += 1
+            stack.append(nb)
+            yield FRONTIER_ADD, nb
+
+    if res.found:
+        res.path = reconstruct_path_ids(parents, s, g, fg.width)
+        stats.path_length = len(res.path)
+        yield PATH, -1
+
+    yield DONE, 1 if res.found else 0
+
+
+def _run_ids_quiet(grid: Grid, start: Pos, goal: Pos) -> SearchResult:
+    fg = as_flat(grid)
+    w = fg.width
+
+    res = new_result(start, goal)
+
+    if start == goal:
+        res.found = True
+        res.path = [start]
+        res.stats.path_length = 1
+        return res
+
+    s = fg.index(start)
+    g = fg.index(goal)
+    parents = new_id_buffer(fg.size)
+    parents[s] = s
+    visited = 1
+
+    stack: list[int] = [s]
+
+    order = res.visited_ids
+    nbs = fg.neighbor_ids
+
+    while stack:
+        current = stack.pop()
+        order.append(current)
+
+        if current == g:
+            res.found = True
+            break
+
+        for nb in nbs(current):
+            if parents[nb] >= 0:
+                continue
+            parents[nb] = current
+            visited += 1
+            stack.append(nb)
+
+    res.parents = parents
+    res.stats.expanded = len(order)
+    res.stats.visited = visited
+    if res.found:
+        res.path = reconstruct_path_ids(parents, s, g, w)
+        res.stats.path_length = len(res.path)
+    return res
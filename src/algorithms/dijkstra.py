@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterator
+
+from ..core.grid import FlatGrid, Grid, Pos
+from ..core.result import SearchResult
+from ..core.trace import DONE, FRONTIER_ADD, FRONTIER_POP, GOAL_FOUND, INIT, PATH, VISIT
+from .common import (
+    AlgorithmConfig, BucketQueue, SearchStepper, as_flat, collect_trace, fill_pos_form, finish_trace, new_id_buffer,
+    new_result, new_trace, reconstruct_path_ids, step_costs,
+)
+
+# Dijkstra over the grid's terrain costs (Grid.costs: stepping onto a cell costs 1..255).
+# Distances are small ints that never go down, so the open list is a BucketQueue.
+# Without a cost layer every step costs 1 and Dijkstra is a BFS: the quiet run then
+# uses a plain FIFO queue instead. The search runs on cell ids; compact=False also gets
+# visited_order / came_from.
+
+INF = 2**31 - 1
+
+
+def run(grid: Grid, start: Pos, goal: Pos, cfg: AlgorithmConfig | None = None) -> SearchResult:
+    cfg = cfg or AlgorithmConfig()
+    fg = as_flat(grid)
+    if not cfg.emit_trace:
+        res = _run_uniform_quiet(fg, start, goal) if fg.costs is None else _run_quiet(fg, start, goal)
+    else:
+        res = new_result(start, goal)
+        trace = new_trace(fg, "Dijkstra", start, goal)
+        collect_trace(_events(fg, start, goal, res), trace)
+        finish_trace(res, cfg, trace)
+    if not cfg.compact:
+        fill_pos_form(res, fg.width)
+    return res
+
+
+def stream(grid: Grid, start: Pos, goal: Pos) -> SearchStepper:
+    fg = as_flat(grid)
+    res = new_result(start, goal)
+    return SearchStepper(_events(fg, start, goal, res), res, fg.width)
+
+
+def _events(fg: FlatGrid, start: Pos, goal: Pos, res: SearchResult) -> Iterator[tuple[int, int]]:
+    w = fg.width
+    s = fg.index(start)
+    g = fg.index(goal)
+    yield INIT, s
+
+    n = fg.size
+    step = step_costs(fg)
+    dist = new_id_buffer(n, INF)
+    dist[s] = 0
+    parents = new_id_buffer(n)
+    parents[s] = s
+    res.parents = parents
+    closed = bytearray(n)
+    stats = res.stats
+    stats.visited = 1
+
+    queue = BucketQueue()
+    queue.push(s, 0)
+    stats.pushes = 1
+    yield FRONTIER_ADD, s
+
+    order = res.visited_ids
+    nbs = fg.neighbor_ids
+    while queue:
+        d, current = queue.pop()
+        stats.pops += 1
+        if closed[current]:
+            stats.stale_pops += 1
+            continue
+        closed[current] = 1
+        yield FRONTIER_POP, current
+
+        order.append(current)
+        stats.expanded += 1
+        yield VISIT, current
+
+        if current == g:
+            res.found = True
+            yield GOAL_FOUND, g
+            break
+
+        for nb in nbs(current):
+            if closed[nb]:
+                continue
+            nd = d + step[nb]
+            old = dist[nb]
+            if nd < old:
+                if old == INF:
+                    stats.visited += 1
+                    yield FRONTIER_ADD, nb
+                dist[nb] = nd
+                parents[nb] = current
+                queue.push(nb, nd)
+                stats.pushes += 1
+
+    if res.found:
+        res.path = reconstruct_path_ids(parents, s, g, w)
+        stats.path_length = len(res.path)
+        yield PATH, -1
+
+    yield DONE, 1 if res.found else 0
+
+
+def _run_quiet(fg: FlatGrid, start: Pos, goal: Pos) -> SearchResult:
+    # _events without the events
+    w = fg.width
+    s = fg.index(start)
+    g = fg.index(goal)
+    n = fg.size
+    costs = fg.costs
+    assert costs is not None
+    res = new_result(start, goal)
+
+    dist = new_id_buffer(n, INF)
+    dist[s] = 0
+    parents = new_id_buffer(n)
+    parents[s] = s
+    closed = bytearray(n)
+    visited = 1
+
+    queue = BucketQueue()
+    queue.push(s, 0)
+    pushes = 1
+    stale = 0
+
+    order = res.visited_ids
+    nbs = fg.neighbor_ids
+    push = queue.push
+    pop = queue.pop
+    while queue:
+        d, current = pop()
+        if closed[current]:
+            stale += 1
+            continue
+        closed[current] = 1
+        order.append(current)
+
+        if current == g:
+            res.found = True
+            break
+
+        for nb in nbs(current):
+            if closed[nb]:
+                continue
+            nd = d + costs[nb]
+            old = dist[nb]
+            if nd < old:
+                if old == INF:
+                    visited += 1
+                dist[nb] = nd
+                parents[nb] = current
+                push(nb, nd)
+                pushes += 1
+
+    _finish_quiet(res, parents, s, g, w, visited, pushes, stale)
+    return res
+
+
+def _run_uniform_quiet(fg: FlatGrid, start: Pos, goal: Pos) -> SearchResult:
+    # Every step costs 1: first reached is final, so a FIFO queue with no duplicates
+    w = fg.width
+    s = fg.index(start)
+    g = fg.index(goal)
+    res = new_result(start, goal)
+
+    parents = new_id_buffer(fg.size)
+    parents[s] = s
+    queue = deque([s])
+    visited = 1
+
+    order = res.visited_ids
+    nbs = fg.neighbor_ids
+    pop = queue.popleft
+    push = queue.append
+    while queue:
+        current = pop()
+        order.append(current)
+        if current == g:
+            res.found = True
+            break
+        for nb in nbs(current):
+            if parents[nb] < 0:
+                parents[nb] = current
+                push(nb)
+                visited += 1
+
+    _finish_quiet(res, parents, s, g, w, visited, visited, 0)
+    return res
+
+
+def _finish_quiet(
+    res: SearchResult, parents, s: int, g: int, w: int, visited: int, pushes: int, stale: int
+) -> None:
+    st = res.stats
+    res.parents = parents
+    st.expanded = len(res.visited_ids)
+    st.visited = visited
+    st.pushes = pushes
+    st.stale_pops = stale
+    st.pops = st.expanded + stale
+    if res.found:
+        res.path = reconstruct_path_ids(parents, s, g, w)
+        st.path_length = len(res.path)
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import heapq
+
+from ..core.grid import FlatGrid, Pos
+from ..core.result import SearchResult
+from .common import new_id_buffer, new_result
+
+# D* Lite (Koenig & Likhachev): an incremental planner that searches backwards from the
+# goal and keeps g/rhs values between calls. Wall changes made through the grid's
+# set_wall()/set_wall_id() are queued by the wall_changed() hook; the next plan() only
+# re-settles the cells whose distance actually changed, and the start may move freely
+# in between (km keeps the old queue keys valid).
+
+INF = 2**31 - 1
+
+
+class DStarLite:
+    def __init__(self, grid: FlatGrid, start: Pos, goal: Pos) -> None:
+        self.grid = grid
+        self.start = start
+        self.goal = goal
+        self._key = f"dstar:{id(self)}"
+        self._reset()
+
+    def _reset(self) -> None:
+        fg = self.grid
+        n = fg.size
+        self.g = new_id_buffer(n, INF)
+        self.rhs = new_id_buffer(n, INF)
+        self._km = 0
+        self._last = self.start
+        self._heap: list[tuple[int, int, int]] = []
+        self._queued: dict[int, tuple[int, int]] = {}  # cell -> current key; heap entries may be stale
+        self._pending: list[int] = []
+        self._stale = False
+
+        goal = fg.index(self.goal)
+        self.rhs[goal] = INF if fg.cells[goal] else 0
+        self._update_vertex(goal)
+        # Registered as derived data so the grid reports every wall change to us
+        fg.derived(self._key, lambda _: self)
+
+    def close(self) -> None:
+        # Stop listening to the grid
+        self.grid.forget(self._key)
+
+    def wall_changed(self, i: int) -> bool:
+        if i < 0:
+            self._stale = True  # whole grid rewritten: start over on the next plan()
+            return False
+        self._pending.append(i)
+        return True
+
+    def move_to(self, pos: Pos) -> None:
+        self.start = pos
+
+    def plan(self) -> SearchResult:
+        # Brings the search up to date and returns the current start..goal path.
+        # stats.expanded counts only the cells settled by this call.
+        if self._stale:
+            self._reset()
+        if self._pending:
+            self._km += abs(self._last[0] - self.start[0]) + abs(self._last[1] - self.start[1])
+            self._last = self.start
+            changed: set[int] = set()
+            for i in self._pending:
+                changed.add(i)
+                changed.update(self._neighbors(i))
+            self._pending.clear()
+            goal = self.grid.index(self.goal)
+            for u in changed:
+                if u != goal:
+                    self.rhs[u] = self._best(u)
+                else:
+                    self.rhs[u] = INF if self.grid.cells[u] else 0
+                self._update_vertex(u)
+
+        res = new_result(self.start, self.goal)
+        res.stats.expanded = self._compute()
+        res.path = self.path()
+        res.found = bool(res.path)
+        res.stats.path_length = len(res.path)
+        return res
+
+    def distance(self, pos: Pos) -> int:
+        # Steps from pos to the goal as of the last plan(), INF if unreachable
+        return self.g[self.grid.index(pos)]
+
+    def path(self) -> list[Pos]:
+        # Greedy descent on g from the start; valid right after plan()
+        fg = self.grid
+        g = self.g
+        cur = fg.index(self.start)
+        goal = fg.index(self.goal)
+        if fg.cells[cur] or g[cur] >= INF:
+            return []
+        w = fg.width
+        path: list[Pos] = [self.start]
+        if cur == goal:
+            return path
+        # Each step goes strictly downhill on a consistent g, so g[start] steps at most;
+        # the bound keeps an inconsistent g from looping forever
+        for _ in range(g[cur]):
+            nbs = self._neighbors(cur)
+            if not nbs:
+                return []
+            cur = min(nbs, key=g.__getitem__)
+            path.append((cur % w, cur // w))
+            if cur == goal:
+                return path
+        return []
+
+    # -- internals --
+
+    def _neighbors(self, i: int) -> list[int]:
+        # Open 4-neighbors (edges to or from walls cost INF). Not neighbor_ids(): a wall has
+        # no moves, but the neighbors of a cell that was just walled are exactly the ones
+        # that need repairing.
+        return self.grid.open_around(i)
+
+    def _best(self, u: int) -> int:
+        if self.grid.cells[u]:
+            return INF
+        g = self.g
+        best = INF
+        for v in self._neighbors(u):
+            if g[v] < best:
+                best = g[v]
+        return best + 1 if best < INF else INF
+
+    def _calc_key(self, u: int) -> tuple[int, int]:
+        m = min(self.g[u], self.rhs[u])
+        if m >= INF:
+            return INF, INF
+        w = self.grid.width
+        sx, sy = self.start
+        return m + abs(u % w - sx) + abs(u // w - sy) + self._km, m
+
+    def _update_vertex(self, u: int) -> None:
+        if self.g[u] != self.rhs[u]:
+            k = self._calc_key(u)
+            if self._queued.get(u) != k:
+                self._queued[u] = k
+                heapq.heappush(self._heap, (k[0], k[1], u))
+        else:
+            self._queued.pop(u, None)
+
+    def _compute(self) -> int:
+        fg = self.grid
+        g, rhs = self.g, self.rhs
+        heap = self._heap
+        queued = self._queued
+        pop = heapq.heappop
+        start = fg.index(self.start)
+        goal = fg.index(self.goal)
+        expanded = 0
+
+        while heap:
+            k1, k2, u = heap[0]
+            if queued.get(u) != (k1, k2):
+                pop(heap)  # stale entry
+                continue
+            if (k1, k2) >= self._calc_key(start) and rhs[start] == g[start]:
+                break
+            k_new = self._calc_key(u)
+            if (k1, k2) < k_new:
+                pop(heap)
+                queued[u] = k_new
+                heapq.heappush(heap, (k_new[0], k_new[1], u))
+                continue
+
+            pop(heap)
+            del queued[u]
+            expanded += 1
+            if g[u] > rhs[u]:
+                # Overconsistent: settle it and offer the shorter route to its neighbors
+                g[u] = rhs[u]
+                via = g[u] + 1
+                for s in self._neighbors(u):
+                    if s != goal and via < rhs[s]:
+                        rhs[s] = via
+                        self._update_vertex(s)
+            else:
+                # Underconsistent: u got worse, so anything that went through it recomputes
+                old = g[u]
+                g[u] = INF
+                for s in self._neighbors(u) + [u]:
+                    if s != goal and (s == u or rhs[s] == old + 1):
+                        rhs[s] = self._best(s)
+                    self._update_vertex(s)
+        return expanded
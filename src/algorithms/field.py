@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+
+from ..core.grid import FlatGrid, Grid, Pos
+from .cache import grid_fingerprint
+from .common import as_flat, new_id_buffer
+
+# Single-source BFS field: distance and parent (next cell towards the source) for every
+# cell of the grid, in two int32 buffers. With the goal as source, any start's path is
+# read off by following parents - O(path), no search - so one field serves any number
+# of players heading to the same goal.
+
+_MAGIC = b"WPDF"
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHHiiii16s")  # magic, format, reserved, w, h, source x, source y, grid fingerprint
+
+
+@dataclass
+class DistanceField:
+    width: int
+    height: int
+    source: Pos
+    dist: array  # steps to the source, -1 = unreachable (or wall)
+    parent: array  # neighbor one step closer to the source, -1 = unreachable
+    fingerprint: bytes = b""  # grid_fingerprint() of the grid it was computed on
+
+    def index(self, p: Pos) -> int:
+        return p[1] * self.width + p[0]
+
+    def reachable(self, p: Pos) -> bool:
+        return self.dist[self.index(p)] >= 0
+
+    def distance(self, p: Pos) -> int:
+        return self.dist[self.index(p)]
+
+    def path_from(self, start: Pos) -> list[Pos]:
+        # start .. source, [] if start can't reach the source
+        w = self.width
+        parent = self.parent
+        cur = self.index(start)
+        if parent[cur] < 0:
+            return []
+        path: list[Pos] = [start]
+        while self.dist[cur]:
+            cur = parent[cur]
+            path.append((cur % w, cur // w))
+        return path
+
+    def path_to(self, target: Pos) -> list[Pos]:
+        # source .. target
+        path = self.path_from(target)
+        path.reverse()
+        return path
+
+    def matches(self, grid: Grid) -> bool:
+        # Was this field computed on a grid with exactly these walls?
+        return self.fingerprint == grid_fingerprint(grid)
+
+    def nbytes(self) -> int:
+        return self.dist.itemsize * len(self.dist) + self.parent.itemsize * len(self.parent)
+
+    def to_bytes(self) -> bytes:
+        header = _HEADER.pack(
+            _MAGIC, _FORMAT_VERSION, 0, self.width, self.height, self.source[0], self.source[1],
+            self.fingerprint.ljust(16, b"\0"),
+        )
+        return header + _le_bytes(self.dist) + _le_bytes(self.parent)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "DistanceField":
+        magic, fmt, _, w, h, sx, sy, fp = _HEADER.unpack_from(data)
+        if magic != _MAGIC or fmt != _FORMAT_VERSION:
+            raise ValueError("not a distance field file (or an unsupported format version)")
+        n = w * h
+        off = _HEADER.size
+        if len(data) != off + 8 * n:
+            raise ValueError(f"expected {off + 8 * n} bytes for a {w}x{h} field, got {len(data)}")
+        dist = _le_array(data[off:off + 4 * n])
+        parent = _le_array(data[off + 4 * n:])
+        return cls(w, h, (sx, sy), dist, parent, fp)
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str, grid: Grid | None = None) -> "DistanceField":
+        # With `grid`, refuses a field that was computed for a different maze
+        with open(path, "rb") as f:
+            field = cls.from_bytes(f.read())
+        if grid is not None and not field.matches(grid):
+            raise ValueError(f"{path}: distance field does not belong to this grid")
+        return field
+
+
+def _le_bytes(a: array) -> bytes:
+    if sys.byteorder == "little":
+        return a.tobytes()
+    b = array(a.typecode, a)
+    b.byteswap()
+    return b.tobytes()
+
+
+def _le_array(data: bytes) -> array:
+    a = array("i")
+    a.frombytes(data)
+    if sys.byteorder != "little":
+        a.byteswap()
+    return a
+
+
+def compute(grid: Grid, source: Pos) -> DistanceField:
+    fg = as_flat(grid)
+    w, h = fg.width, fg.height
+    n = fg.size
+    cells = fg.cells
+    dist = new_id_buffer(n)
+    parent = new_id_buffer(n)
+    field = DistanceField(w, h, source, dist, parent, grid_fingerprint(fg))
+    s = fg.index(source)
+    if cells[s]:
+        return field
+
+    dist[s] = 0
+    parent[s] = s
+    # The queue only grows, so it doubles as the BFS order
+    queue = array("i", [s])
+    push = queue.append
+    head = 0
+    while head < len(queue):
+        cur = queue[head]
+        head += 1
+        d = dist[cur] + 1
+        y, x = divmod(cur, w)
+        if x + 1 < w and dist[cur + 1] < 0 and not cells[cur + 1]:
+            dist[cur + 1] = d
+            parent[cur + 1] = cur
+            push(cur + 1)
+        if x > 0 and dist[cur - 1] < 0 and not cells[cur - 1]:
+            dist[cur - 1] = d
+            parent[cur - 1] = cur
+            push(cur - 1)
+        if y + 1 < h and dist[cur + w] < 0 and not cells[cur + w]:
+            dist[cur + w] = d
+            parent[cur + w] = cur
+            push(cur + w)
+        if y > 0 and dist[cur - w] < 0 and not cells[cur - w]:
+            dist[cur - w] = d
+            parent[cur - w] = cur
+            push(cur - w)
+    return field
+
+
+def shared(grid: FlatGrid, source: Pos) -> DistanceField:
+    # One field per (grid, source), cached on the grid until a wall changes
+    return grid.derived(f"field:{source[0]},{source[1]}", lambda g: compute(g, source))
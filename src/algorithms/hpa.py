@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import heapq
+from collections import deque
+from typing import Iterator
+
+from ..core.grid import FlatGrid, Grid, Pos
+from ..core.result import SearchResult
+from ..core.trace import DONE, FRONTIER_ADD, FRONTIER_POP, GOAL_FOUND, INIT, PATH, VISIT
+from .common import (
+    AlgorithmConfig, SearchStepper, as_flat, collect_trace, drain, fill_pos_form, finish_trace, new_result, new_trace,
+)
+
+# HPA*: hierarchical path-finding over square clusters.
+#
+# Every open stretch of a border between two clusters gets one or two transitions (a pair
+# of facing cells, one per side). Transition cells are the abstract nodes; they are linked
+# across the border with cost 1 and, inside a cluster, by their BFS distance within that
+# cluster. A query connects start and goal to the nodes of their own clusters, searches
+# the small abstract graph, then refines each abstract edge with a cluster-local BFS.
+# Paths are complete but only near-optimal (an edge never leaves its cluster).
+
+DEFAULT_CLUSTER = 16
+_SPLIT_RUN = 6  # open border stretches at least this long get a transition at each end
+
+Border = tuple[int, int]  # (cluster, cluster to its right or below)
+
+
+def run(grid: Grid, start: Pos, goal: Pos, cfg: AlgorithmConfig | None = None) -> SearchResult:
+    cfg = cfg or AlgorithmConfig()
+    fg = as_flat(grid)
+    res = new_result(start, goal)
+    events = _events(hierarchy(fg), start, goal, res)
+    if not cfg.emit_trace:
+        drain(events)
+    else:
+        trace = new_trace(fg, "HPA*", start, goal)
+        collect_trace(events, trace)
+        finish_trace(res, cfg, trace)
+    if not cfg.compact:
+        fill_pos_form(res, fg.width)
+    return res
+
+
+def stream(grid: Grid, start: Pos, goal: Pos) -> SearchStepper:
+    fg = as_flat(grid)
+    res = new_result(start, goal)
+    return SearchStepper(_events(hierarchy(fg), start, goal, res), res, fg.width)
+
+
+def hierarchy(fg: FlatGrid, cluster: int = DEFAULT_CLUSTER) -> ClusterGraph:
+    # Built on first use and cached on the grid; set_wall() patches it in place
+    return fg.derived(f"hpa:{cluster}", lambda g: ClusterGraph(g, cluster))
+
+
+class ClusterGraph:
+    def __init__(self, grid: FlatGrid, cluster: int = DEFAULT_CLUSTER) -> None:
+        if cluster < 2:
+            raise ValueError("cluster size must be at least 2")
+        self.grid = grid
+        self.cluster = cluster
+        self.cols = -(-grid.width // cluster)
+        self.rows = -(-grid.height // cluster)
+        self.rebuilds = 0  # clusters whose intra-cluster edges were (re)computed
+
+        self._transitions: dict[Border, list[tuple[int, int]]] = {}
+        self._inter: dict[int, set[int]] = {}  # node -> facing nodes in neighboring clusters
+        self._intra: list[dict[int, dict[int, int]]] = [{} for _ in range(self.cols * self.rows)]
+        self._dirty_borders: set[Border] = set(self._all_borders())
+        self._dirty_clusters: set[int] = set(range(self.cols * self.rows))
+        self.refresh()
+
+    # -- layout --
+
+    def cluster_of(self, i: int) -> int:
+        y, x = divmod(i, self.grid.width)
+        return (y // self.cluster) * self.cols + x // self.cluster
+
+    def bounds(self, k: int) -> tuple[int, int, int, int]:
+        cy, cx = divmod(k, self.cols)
+        c = self.cluster
+        return cx * c, cy * c, min(self.grid.width, cx * c + c), min(self.grid.height, cy * c + c)
+
+    def _all_borders(self) -> Iterator[Border]:
+        for k in range(self.cols * self.rows):
+            if k % self.cols + 1 < self.cols:
+                yield k, k + 1
+            if k + self.cols < self.cols * self.rows:
+                yield k, k + self.cols
+
+    def _borders_of(self, k: int) -> list[Border]:
+        cols = self.cols
+        out: list[Border] = []
+        if k % cols:
+            out.append((k - 1, k))
+        if k % cols + 1 < cols:
+            out.append((k, k + 1))
+        if k >= cols:
+            out.append((k - cols, k))
+        if k + cols < cols * self.rows:
+            out.append((k, k + cols))
+        return out
+
+    def _side_by_side(self, b: Border) -> bool:
+        return self.cols > 1 and b[1] == b[0] + 1
+
+    def nodes(self, k: int) -> set[int]:
+        out: set[int] = set()
+        for b in self._borders_of(k):
+            side = 0 if b[0] == k else 1
+            out.update(t[side] for t in self._transitions.get(b, ()))
+        return out
+
+    # -- maintenance --
+
+    def wall_changed(self, i: int) -> bool:
+        # FlatGrid hook: only the cluster holding i (and any border it sits on) goes stale
+        if i < 0:
+            return False
+        k = self.cluster_of(i)
+        self._dirty_clusters.add(k)
+        y, x = divmod(i, self.grid.width)
+        x0, y0, x1, y1 = self.bounds(k)
+        for b in self._borders_of(k):
+            other = b[1] if b[0] == k else b[0]
+            if self._side_by_side(b):
+                on_border = x == (x0 if other < k else x1 - 1)
+            else:
+                on_border = y == (y0 if other < k else y1 - 1)
+            if on_border:
+                self._dirty_borders.add(b)
+                self._dirty_clusters.add(other)
+        return True
+
+    def refresh(self) -> None:
+        for b in self._dirty_borders:
+            for a, c in self._transitions.pop(b, ()):
+                self._unlink(a, c)
+            found = self._find_transitions(b)
+            self._transitions[b] = found
+            for a, c in found:
+                self._inter.setdefault(a, set()).add(c)
+                self._inter.setdefault(c, set()).add(a)
+        for k in self._dirty_clusters:
+            self._build_intra(k)
+        self.rebuilds += len(self._dirty_clusters)
+        self._dirty_borders.clear()
+        self._dirty_clusters.clear()
+
+    def _unlink(self, a: int, c: int) -> None:
+        for u, v in ((a, c), (c, a)):
+            nbs = self._inter.get(u)
+            if nbs is not None:
+                nbs.discard(v)
+                if not nbs:
+                    del self._inter[u]
+
+    def _find_transitions(self, b: Border) -> list[tuple[int, int]]:
+        w = self.grid.width
+        cells = self.grid.cells
+        k, m = b
+        x0, y0, x1, y1 = self.bounds(k)
+        if self._side_by_side(b):
+            pairs = [(y * w + x1 - 1, y * w + x1) for y in range(y0, y1)]
+        else:
+            pairs = [((y1 - 1) * w + x, y1 * w + x) for x in range(x0, x1)]
+
+        out: list[tuple[int, int]] = []
+        run: list[tuple[int, int]] = []
+        for pair in pairs + [(-1, -1)]:
+            if pair[0] >= 0 and not cells[pair[0]] and not cells[pair[1]]:
+                run.append(pair)
+                continue
+            if len(run) >= _SPLIT_RUN:
+                out += (run[0], run[-1])
+            elif run:
+                out.append(run[len(run) // 2])
+            run = []
+        return out
+
+    def _build_intra(self, k: int) -> None:
+        nodes = self.nodes(k)
+        intra: dict[int, dict[int, int]] = {}
+        for u in nodes:
+            dist = self.local_distances(u, nodes)
+            dist.pop(u, None)
+            intra[u] = dist
+        self._intra[k] = intra
+
+    def local_distances(self, src: int, targets: set[int]) -> dict[int, int]:
+        # Distances from src to the targets it reaches without leaving its cluster
+        return self._local_bfs(self.cluster_of(src), src, targets)[0]
+
+    def _local_bfs(self, k: int, src: int, targets: set[int], stop: int = -1) -> tuple[dict[int, int], dict[int, int]]:
+        # BFS that never leaves cluster k; returns (distances to reached targets, parents)
+        w = self.grid.width
+        cells = self.grid.cells
+        x0, y0, x1, y1 = self.bounds(k)
+        dist = {src: 0}
+        parent = {src: src}
+        found: dict[int, int] = {src: 0} if src in targets else {}
+        q = deque([src])
+        while q:
+            cur = q.popleft()
+            if cur == stop:
+                break
+            d = dist[cur] + 1
+            y, x = divmod(cur, w)
+            for nb, ok in ((cur + 1, x + 1 < x1), (cur - 1, x > x0), (cur + w, y + 1 < y1), (cur - w, y > y0)):
+                if ok and nb not in dist and not cells[nb]:
+                    dist[nb] = d
+                    parent[nb] = cur
+                    if nb in targets:
+                        found[nb] = d
+                        if stop < 0 and len(found) == len(targets):
+                            return found, parent
+                    q.append(nb)
+        return found, parent
+
+    # -- queries --
+
+    def neighbors(self, u: int) -> list[tuple[int, int]]:
+        out = list(self._intra[self.cluster_of(u)].get(u, {}).items())
+        out += [(v, 1) for v in self._inter.get(u, ())]
+        return out
+
+    def refine(self, a: int, b: int) -> list[int]:
+        # Cells after a up to b for one abstract edge (adjacent, or inside one cluster)
+        k = self.cluster_of(a)
+        if k != self.cluster_of(b):
+            return [b]
+        parent = self._local_bfs(k, a, {b}, b)[1]
+        out: list[int] = []
+        cur = b
+        while cur != a:
+            out.append(cur)
+            cur = parent[cur]
+        out.reverse()
+        return out
+
+    def abstract_size(self) -> tuple[int, int]:
+        # (nodes, directed edges) of the abstract graph
+        nodes = set(self._inter)
+        edges = sum(len(v) for v in self._inter.values())
+        for intra in self._intra:
+            nodes.update(intra)
+            edges += sum(len(v) for v in intra.values())
+        return len(nodes), edges
+
+
+def _events(cg: ClusterGraph, start: Pos, goal: Pos, res: SearchResult) -> Iterator[tuple[int, int]]:
+    fg = cg.grid
+    cg.refresh()
+    w = fg.width
+    s = fg.index(start)
+    g = fg.index(goal)
+    yield INIT, s
+
+    stats = res.stats
+    if fg.cells[s] or fg.cells[g]:
+        yield DONE, 0
+        return
+
+    # Temporary edges: start -> nodes of its cluster, nodes of the goal's cluster -> goal
+    ks, kg = cg.cluster_of(s), cg.cluster_of(g)
+    start_targets = cg.nodes(ks)
+    if ks == kg:
+        start_targets.add(g)
+    from_start = list(cg.local_distances(s, start_targets).items()) + cg.neighbors(s)
+    to_goal = cg.local_distances(g, cg.nodes(kg))
+
+    g_score = {s: 0}
+    parents = {s: s}
+    closed: set[int] = set()
+    gx, gy = goal
+    open_heap = [(abs(start[0] - gx) + abs(start[1] - gy), 0, s)]
+    tie = 0
+    stats.visited = 1
+    yield FRONTIER_ADD, s
+
+    while open_heap:
+        _, _, cur = heapq.heappop(open_heap)
+        if cur in closed:
+            continue
+        closed.add(cur)
+        yield FRONTIER_POP, cur
+        res.visited_ids.append(cur)
+        stats.expanded += 1
+        yield VISIT, cur
+        if cur == g:
+            break
+
+        edges = from_start if cur == s else cg.neighbors(cur)
+        if cur in to_goal:
+            edges = edges + [(g, to_goal[cur])]
+
+        base = g_score[cur]
+        for nb, cost in edges:
+            ng = base + cost
+            if nb == cur or nb in closed or ng >= g_score.get(nb, ng + 1):
+                continue
+            if nb not in g_score:
+                stats.visited += 1
+                yield FRONTIER_ADD, nb
+            g_score[nb] = ng
+            parents[nb] = cur
+            y, x = divmod(nb, w)
+            tie += 1
+            heapq.heappush(open_heap, (ng + abs(x - gx) + abs(y - gy), tie, nb))
+
+    if g in closed:
+        res.found = True
+        yield GOAL_FOUND, g
+        hops = [g]
+        while hops[-1] != s:
+            hops.append(parents[hops[-1]])
+        hops.reverse()
+        cells = [s]
+        for a, b in zip(hops, hops[1:]):
+            cells += cg.refine(a, b)
+        res.path = [(i % w, i // w) for i in cells]
+        stats.path_length = len(res.path)
+        yield PATH, -1
+
+    yield DONE, 1 if res.found else 0
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import heapq
+from array import array
+from typing import Callable, Iterator
+
+from ..core.grid import FlatGrid, Grid, Pos
+from ..core.result import SearchResult
+from ..core.trace import DONE, FRONTIER_ADD, FRONTIER_POP, GOAL_FOUND, INIT, PATH, VISIT
+from .common import (
+    AlgorithmConfig, SearchStepper, as_flat, collect_trace, drain, fill_pos_form, finish_trace, new_id_buffer,
+    new_result, new_trace,
+)
+
+# Jump Point Search for 4-connected, uniform-cost grids.
+#
+# Canonical order: among equal-length paths prefer the one that turns vertical as early
+# as possible. A horizontal jump therefore only stops where a vertical move opens up that
+# was blocked one column back (a forced neighbor), and a vertical jump stops wherever a
+# horizontal jump from that cell finds something. Only these jump points enter the open
+# list; the straight runs between them are filled back in when the path is rebuilt.
+#
+# JPS+ (`plus=True`) precomputes every jump once per grid: for each cell and direction,
+# +d = the next jump point is d cells away, -d = d open cells before a wall. The goal is
+# the only query-dependent stop and is checked against those distances at run time.
+
+INF = 2**31 - 1
+
+RIGHT, LEFT, DOWN, UP = 0, 1, 2, 3
+# Directions to try from a jump point, keyed by the direction it was reached in
+_NEXT = ((RIGHT, DOWN, UP), (LEFT, DOWN, UP), (DOWN, RIGHT, LEFT), (UP, RIGHT, LEFT))
+# ... and by the bit mask of every direction it was reached in (0b1111 for the start)
+_NEXT_BY_MASK = tuple(
+    tuple(sorted({d for a in range(4) if mask >> a & 1 for d in _NEXT[a]})) for mask in range(16)
+)
+
+JumpFn = Callable[[int, int], int]  # (cell, direction) -> jump point or -1
+
+
+def run(grid: Grid, start: Pos, goal: Pos, cfg: AlgorithmConfig | None = None, plus: bool = False) -> SearchResult:
+    cfg = cfg or AlgorithmConfig()
+    fg = as_flat(grid)
+    res = new_result(start, goal)
+    events = _events(fg, start, goal, res, plus)
+    if not cfg.emit_trace:
+        drain(events)
+    else:
+        trace = new_trace(fg, "JPS+" if plus else "JPS", start, goal)
+        collect_trace(events, trace)
+        finish_trace(res, cfg, trace)
+    if not cfg.compact:
+        fill_pos_form(res, fg.width)
+    return res
+
+
+def run_plus(grid: Grid, start: Pos, goal: Pos, cfg: AlgorithmConfig | None = None) -> SearchResult:
+    return run(grid, start, goal, cfg, plus=True)
+
+
+def stream(grid: Grid, start: Pos, goal: Pos, plus: bool = False) -> SearchStepper:
+    fg = as_flat(grid)
+    res = new_result(start, goal)
+    return SearchStepper(_events(fg, start, goal, res, plus), res, fg.width)
+
+
+def stream_plus(grid: Grid, start: Pos, goal: Pos) -> SearchStepper:
+    return stream(grid, start, goal, plus=True)
+
+
+def jump_tables(fg: FlatGrid) -> tuple[array, array, array, array]:
+    # JPS+ distances (RIGHT, LEFT, DOWN, UP), built once and cached on the grid
+    return fg.derived("jps+", _build_tables)
+
+
+def _build_tables(fg: FlatGrid) -> tuple[array, array, array, array]:
+    w, h = fg.width, fg.height
+    c = fg.cells
+    n = w * h
+    right = array("i", bytes(4 * n))
+    left = array("i", bytes(4 * n))
+    down = array("i", bytes(4 * n))
+    up = array("i", bytes(4 * n))
+
+    def forced(i: int, y: int, dx: int) -> bool:
+        # Horizontal move into i (coming from i - dx) gains a vertical neighbor
+        return ((y > 0 and not c[i - w] and c[i - w - dx] != 0)
+                or (y + 1 < h and not c[i + w] and c[i + w - dx] != 0))
+
+    def extend(d: int) -> int:
+        return d + 1 if d > 0 else d - 1
+
+    for y in range(h):
+        row = y * w
+        for x in range(w - 2, -1, -1):
+            i = row + x
+            if c[i] or c[i + 1]:
+                continue
+            right[i] = 1 if forced(i + 1, y, 1) else extend(right[i + 1])
+        for x in range(1, w):
+            i = row + x
+            if c[i] or c[i - 1]:
+                continue
+            left[i] = 1 if forced(i - 1, y, -1) else extend(left[i - 1])
+
+    # A vertical jump stops on any cell with a horizontal jump point
+    for y in range(h - 2, -1, -1):
+        for i in range(y * w, y * w + w):
+            j = i + w
+            if c[i] or c[j]:
+                continue
+            down[i] = 1 if right[j] > 0 or left[j] > 0 else extend(down[j])
+    for y in range(1, h):
+        for i in range(y * w, y * w + w):
+            j = i - w
+            if c[i] or c[j]:
+                continue
+            up[i] = 1 if right[j] > 0 or left[j] > 0 else extend(up[j])
+    return right, left, down, up
+
+
+def _scan_jumps(fg: FlatGrid, goal: int) -> JumpFn:
+    w, h = fg.width, fg.height
+    c = fg.cells
+
+    def horizontal(i: int, dx: int) -> int:
+        y, x = divmod(i, w)
+        has_up = y > 0
+        has_down = y + 1 < h
+        while True:
+            x += dx
+            i += dx
+            if x < 0 or x >= w or c[i]:
+                return -1
+            if i == goal:
+                return i
+            if has_up and not c[i - w] and c[i - w - dx]:
+                return i
+            if has_down and not c[i + w] and c[i + w - dx]:
+                return i
+
+    def vertical(i: int, dy: int) -> int:
+        y = i // w
+        step = dy * w
+        while True:
+            y += dy
+            i += step
+            if y < 0 or y >= h or c[i]:
+                return -1
+            if i == goal or horizontal(i, 1) >= 0 or horizontal(i, -1) >= 0:
+                return i
+
+    def jump(i: int, d: int) -> int:
+        if d == RIGHT:
+            return horizontal(i, 1)
+        if d == LEFT:
+            return horizontal(i, -1)
+        return vertical(i, 1 if d == DOWN else -1)
+
+    return jump
+
+
+def _table_jumps(fg: FlatGrid, goal: int) -> JumpFn:
+    w = fg.width
+    tables = jump_tables(fg)
+    right, left = tables[RIGHT], tables[LEFT]
+    gy, gx = divmod(goal, w)
+
+    def jump(i: int, dr: int) -> int:
+        d = tables[dr][i]
+        reach = d if d > 0 else -d
+        if reach == 0:
+            return -1
+        y, x = divmod(i, w)
+        if dr <= LEFT:
+            ahead = gx - x if dr == RIGHT else x - gx
+            if y == gy and 0 < ahead <= reach:
+                return goal
+            if d <= 0:
+                return -1
+            return i + d if dr == RIGHT else i - d
+
+        dy = 1 if dr == DOWN else -1
+        stop = d if d > 0 else INF
+        ahead = (gy - y) * dy
+        if 0 < ahead <= reach and ahead < stop:
+            # The goal row: stop there if the goal is in this column or in plain sight along the row
+            cell = i + ahead * dy * w
+            if gx == x:
+                return cell
+            side = right[cell] if gx > x else left[cell]
+            if side > 0 or -side >= abs(gx - x):
+                return cell
+        return i + stop * dy * w if d > 0 else -1
+
+    return jump
+
+
+def _events(
+    fg: FlatGrid, start: Pos, goal: Pos, res: SearchResult, plus: bool = False
+) -> Iterator[tuple[int, int]]:
+    w = fg.width
+    s = fg.index(start)
+    g = fg.index(goal)
+    yield INIT, s
+
+    n = fg.size
+    g_score = new_id_buffer(n, INF)
+    parents = new_id_buffer(n)
+    g_score[s] = 0
+    parents[s] = s
+    res.parents = parents
+    # Directions each jump point was reached in (bit per direction); ties keep them all
+    arrived = bytearray(n)
+    arrived[s] = 0b1111
+    closed = bytearray(n)
+
+    stats = res.stats
+    stats.visited = 1
+    order = res.visited_ids
+    jump = (_table_jumps if plus else _scan_jumps)(fg, g)
+    push = heapq.heappush
+    pop = heapq.heappop
+    gx, gy = goal
+
+    open_heap: list[tuple[int, int, int]] = [(abs(start[0] - gx) + abs(start[1] - gy), 0, s)]
+    tie = 0
+    yield FRONTIER_ADD, s
+
+    while open_heap:
+        _, _, cur = pop(open_heap)
+        if closed[cur]:
+            continue
+        closed[cur] = 1
+        yield FRONTIER_POP, cur
+        order.append(cur)
+        stats.expanded += 1
+        yield VISIT, cur
+
+        if cur == g:
+            res.found = True
+            yield GOAL_FOUND, cur
+            res.path = _expand_path(parents, s, g, w)
+            stats.path_length = len(res.path)
+            yield PATH, -1
+            break
+
+        cy, cx = divmod(cur, w)
+        base = g_score[cur]
+        for d in _NEXT_BY_MASK[arrived[cur]]:
+            nb = jump(cur, d)
+            if nb < 0 or closed[nb]:
+                continue
+            ny, nx = divmod(nb, w)
+            ng = base + abs(nx - cx) + abs(ny - cy)
+            old = g_score[nb]
+            if ng > old:
+                continue
+            if ng == old:
+                arrived[nb] |= 1 << d
+                continue
+            if old == INF:
+                stats.visited += 1
+                yield FRONTIER_ADD, nb
+            g_score[nb] = ng
+            parents[nb] = cur
+            arrived[nb] = 1 << d
+            tie += 1
+            push(open_heap, (ng + abs(nx - gx) + abs(ny - gy), tie, nb))
+
+    yield DONE, 1 if res.found else 0
+
+
+def _expand_path(parents: array, start: int, goal: int, width: int) -> list[Pos]:
+    # Jump points are joined by straight runs; walk each run cell by cell
+    points = [goal]
+    cur = goal
+    while cur != start:
+        cur = parents[cur]
+        points.append(cur)
+    points.reverse()
+
+    sy, sx = divmod(start, width)
+    path: list[Pos] = [(sx, sy)]
+    for a, b in zip(points, points[1:]):
+        step = (width if b > a else -width) if abs(b - a) >= width else (1 if b > a else -1)
+        for i in range(a + step, b + step, step):
+            y, x = divmod(i, width)
+            path.append((x, y))
+    return path
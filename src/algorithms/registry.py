@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import importlib
+from types import ModuleType
+from typing import Callable
+
+from ..core.grid import Grid, Pos
+from ..core.result import SearchResult
+from .common import AlgorithmConfig, SearchStepper
+
+RunFn = Callable[[Grid, Pos, Pos, AlgorithmConfig], SearchResult]
+StreamFn = Callable[[Grid, Pos, Pos], SearchStepper]
+
+# name -> module in this package exposing run(grid, start, goal, cfg),
+# or "module:function" for a variant with a different entry point
+ALGORITHMS: dict[str, str] = {
+    "bfs": "bfs",
+    "dfs": "dfs",
+    "astar": "astar",
+    "bibfs": "bibfs",
+    "biastar": "biastar",
+    "jps": "jps",
+    "jps+": "jps:run_plus",
+    "hpa": "hpa",
+    "corridor": "corridor",
+    "wavefront": "wavefront",
+    "dijkstra": "dijkstra",
+}
+
+
+def load(name: str) -> ModuleType:
+    try:
+        module = ALGORITHMS[name]
+    except KeyError:
+        raise ValueError(f"unknown algorithm {name!r} (expected one of {', '.join(ALGORITHMS)})") from None
+    return importlib.import_module(f".{module.partition(':')[0]}", __package__)
+
+
+def get_run(name: str) -> RunFn:
+    return getattr(load(name), ALGORITHMS[name].partition(":")[2] or "run")
+
+
+def get_stream(name: str) -> StreamFn:
+    # Incremental counterpart of the run entry point: run -> stream, run_plus -> stream_plus
+    entry = ALGORITHMS[name].partition(":")[2] or "run"
+    return getattr(load(name), "stream" + entry[len("run"):])
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import re
+from typing import Iterator
+
+from ..core.grid import FlatGrid, Grid, Pos
+from ..core.mazefile import pack_bits
+from ..core.result import SearchResult
+from ..core.trace import DONE, FRONTIER_ADD, FRONTIER_POP, GOAL_FOUND, INIT, LEVEL, PATH, VISIT
+from .common import (
+    AlgorithmConfig, SearchStepper, as_flat, collect_trace, drain, fill_pos_form, finish_trace, new_id_buffer,
+    new_result, new_trace,
+)
+
+try:
+    import numpy as np
+except ImportError:  # optional: the bitboard engine needs nothing
+    np = None
+
+# Level-synchronous BFS: the whole frontier of depth d is expanded at once into depth d+1.
+# Wide frontiers go to a vector engine that shifts the frontier in all four directions
+# (NumPy index arrays, or Python big ints used as bitboards when NumPy is missing);
+# narrow ones - maze corridors - are expanded cell by cell, where a whole-grid
+# operation per level would cost far more than it saves.
+#
+# Results match bfs.run in path length; the path itself may differ among equally short
+# ones, and stats count whole levels (expanded = cells of the levels before the goal's,
+# plus the goal; visited = cells reached). The trace closes each depth with a LEVEL
+# event, so a player can show one wavefront per step (SearchStepper.step_level).
+
+ENGINES = ("numpy", "bits")
+
+
+def default_engine() -> str:
+    return "numpy" if np is not None else "bits"
+
+
+def run(
+    grid: Grid, start: Pos, goal: Pos, cfg: AlgorithmConfig | None = None, engine: str | None = None
+) -> SearchResult:
+    cfg = cfg or AlgorithmConfig()
+    fg = as_flat(grid)
+    res = new_result(start, goal)
+    events = _events(fg, start, goal, res, engine)
+    if not cfg.emit_trace:
+        drain(events)
+    else:
+        trace = new_trace(fg, "Wavefront BFS", start, goal)
+        collect_trace(events, trace)
+        finish_trace(res, cfg, trace)
+    if not cfg.compact:
+        fill_pos_form(res, fg.width)
+    return res
+
+
+def stream(grid: Grid, start: Pos, goal: Pos, engine: str | None = None) -> SearchStepper:
+    fg = as_flat(grid)
+    res = new_result(start, goal)
+    return SearchStepper(_events(fg, start, goal, res, engine), res, fg.width)
+
+
+def _make_engine(fg: FlatGrid, engine: str | None) -> _NumpyEngine | _BitEngine:
+    engine = engine or default_engine()
+    if engine == "numpy":
+        if np is None:
+            raise ValueError("the numpy engine needs numpy installed")
+        return _NumpyEngine(fg)
+    if engine == "bits":
+        return _BitEngine(fg)
+    raise ValueError(f"unknown engine {engine!r} (expected one of {', '.join(ENGINES)})")
+
+
+class _NumpyEngine:
+    min_frontier = 64  # below this, per-level NumPy overhead beats the per-cell loop
+
+    def __init__(self, fg: FlatGrid) -> None:
+        self.w = fg.width
+        self.n = fg.size
+        self.free = np.frombuffer(bytes(fg.cells), dtype=np.uint8) == 0  # open and not reached yet
+
+    def mark(self, ids: list[int]) -> None:
+        self.free[ids] = False
+
+    def expand(self, frontier: list[int]) -> list[int]:
+        w, n = self.w, self.n
+        f = np.asarray(frontier, dtype=np.int64)
+        x = f % w
+        cand = np.concatenate((f[x < w - 1] + 1, f[x > 0] - 1, f[f < n - w] + w, f[f >= w] - w))
+        cand = np.unique(cand[self.free[cand]])
+        self.free[cand] = False
+        return cand.tolist()
+
+
+# Bit b set in a byte -> the b values, for reading cell ids back out of a bitboard
+_BITS = [tuple(b for b in range(8) if v >> b & 1) for v in range(256)]
+_NONZERO = re.compile(rb"[^\x00]")
+_OPEN = bytes([1] + [0] * 255)  # translate table: wall byte -> 0, open -> 1
+
+
+class _BitEngine:
+    # Bit i of a Python int = cell i, so one shift moves the whole frontier a cell over
+    # A wide step costs a few big-int passes over the whole grid: measured break-even with
+    # the per-cell loop is a frontier of about n / 1000 cells
+    min_frontier_ratio = 1024
+
+    def __init__(self, fg: FlatGrid) -> None:
+        w, n = fg.width, fg.size
+        self.w = w
+        self.n = n
+        self.min_frontier = max(64, n // self.min_frontier_ratio)
+        self.open = _to_int(pack_bits(bytes(fg.cells).translate(_OPEN)))
+        row_not_first = b"\x00" + b"\x01" * (w - 1)
+        self.not_first_col = _to_int(pack_bits(row_not_first * fg.height))
+        self.not_last_col = _to_int(pack_bits(row_not_first[::-1] * fg.height))
+        self.seen = bytearray(n)
+        # open & ~seen, and the frontier, as bits; valid while levels stay wide (no mark())
+        self._free: int | None = None
+        self._frontier = 0
+
+    def mark(self, ids: list[int]) -> None:
+        seen = self.seen
+        for i in ids:
+            seen[i] = 1
+        self._free = None
+
+    def expand(self, frontier: list[int]) -> list[int]:
+        free = self._free
+        f = self._frontier
+        if free is None:
+            free = self.open & ~_to_int(pack_bits(self.seen))
+            bits = bytearray(self.n)
+            for i in frontier:
+                bits[i] = 1
+            f = _to_int(pack_bits(bits))
+        nxt = ((f << 1) & self.not_first_col | (f >> 1) & self.not_last_col | f << self.w | f >> self.w) & free
+        self._free = free & ~nxt
+        self._frontier = nxt
+
+        data = nxt.to_bytes((self.n + 7) // 8, "little")
+        out: list[int] = []
+        for m in _NONZERO.finditer(data):
+            j = m.start()
+            base = j * 8
+            out += [base + b for b in _BITS[data[j]]]
+        seen = self.seen
+        for i in out:
+            seen[i] = 1
+        return out
+
+
+def _to_int(packed: bytes) -> int:
+    return int.from_bytes(packed, "little")
+
+
+def _events(
+    fg: FlatGrid, start: Pos, goal: Pos, res: SearchResult, engine: str | None
+) -> Iterator[tuple[int, int]]:
+    s = fg.index(start)
+    g = fg.index(goal)
+    yield INIT, s
+
+    stats = res.stats
+    if fg.cells[s] or fg.cells[g]:
+        yield DONE, 0
+        return
+
+    vec = _make_engine(fg, engine)
+    dist = new_id_buffer(fg.size)
+    dist[s] = 0
+    stats.visited = 1
+    vec.mark([s])
+    yield FRONTIER_ADD, s
+
+    nbs = fg.neighbor_ids
+    order = res.visited_ids
+    frontier = [s]
+    depth = 0
+    while frontier:
+        if dist[g] == depth:
+            yield FRONTIER_POP, g
+            order.append(g)
+            stats.expanded += 1
+            yield VISIT, g
+            res.found = True
+            yield GOAL_FOUND, g
+            yield LEVEL, depth
+            break
+
+        for i in frontier:
+            yield FRONTIER_POP, i
+            yield VISIT, i
+        order.extend(frontier)
+        stats.expanded += len(frontier)
+
+        depth += 1
+        if len(frontier) >= vec.min_frontier:
+            nxt = vec.expand(frontier)
+            for i in nxt:
+                dist[i] = depth
+        else:
+            nxt = []
+            for i in frontier:
+                for nb in nbs(i):
+                    if dist[nb] < 0:
+                        dist[nb] = depth
+                        nxt.append(nb)
+            vec.mark(nxt)
+        stats.visited += len(nxt)
+        for i in nxt:
+            yield FRONTIER_ADD, i
+        yield LEVEL, depth - 1
+        frontier = nxt
+
+    if res.found:
+        res.path = _walk_back(fg, dist, s, g)
+        stats.path_length = len(res.path)
+        yield PATH, -1
+
+    yield DONE, 1 if res.found else 0
+
+
+def _walk_back(fg: FlatGrid, dist, s: int, g: int) -> list[Pos]:
+    # From the goal, repeatedly step to any neighbor one level closer to the start
+    w = fg.width
+    cur = g
+    cells = [g]
+    while cur != s:
+        d = dist[cur] - 1
+        cur = next(nb for nb in fg.neighbor_ids(cur) if dist[nb] == d)
+        cells.append(cur)
+    cells.reverse()
+    return [(i % w, i // w) for i in cells]
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Iterable, Iterator, Sequence
+
+from .algorithms.common import AlgorithmConfig
+from .algorithms.registry import ALGORITHMS, get_run
+from .cli_args import parse_seeds, parse_size
+from .core.grid import FlatGrid, Pos
+from .core.maze import make_maze
+from .core.mazefile import cached_maze
+
+_CFG = AlgorithmConfig(emit_trace=False, compact=True)
+
+_MOVES = {(1, 0): "R", (-1, 0): "L", (0, 1): "D", (0, -1): "U"}
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    seed: int
+    width: int
+    height: int
+    algo: str
+
+
+@dataclass(frozen=True)
+class BatchRecord:
+    seed: int
+    width: int
+    height: int
+    algo: str
+    found: bool
+    expanded: int
+    visited: int
+    path_length: int
+    moves: str = ""  # path as R/L/D/U steps from start, only with include_paths
+
+
+def encode_moves(path: list[Pos]) -> str:
+    return "".join(_MOVES[(b[0] - a[0], b[1] - a[1])] for a, b in zip(path, path[1:]))
+
+
+def make_jobs(sizes: Iterable[tuple[int, int]], seeds: Iterable[int], algos: Sequence[str]) -> list[BatchJob]:
+    # Jobs for the same maze are kept adjacent so a worker regenerates it only once
+    return [BatchJob(seed, w, h, algo) for w, h in sizes for seed in seeds for algo in algos]
+
+
+# Per-process cache of the last generated maze (jobs arrive grouped by maze)
+_maze_key: tuple[int, int, int] | None = None
+_maze: tuple[FlatGrid, Pos, Pos] | None = None
+
+
+def _solve(job: BatchJob, include_paths: bool, maze_dir: str | None = None) -> tuple:
+    global _maze_key, _maze
+    key = (job.seed, job.width, job.height)
+    if key != _maze_key or _maze is None:
+        if maze_dir:
+            m = cached_maze(maze_dir, job.width, job.height, job.seed)
+            _maze = m.grid, m.start, m.goal
+        else:
+            _maze = make_maze(job.width, job.height, job.seed)
+        _maze_key = key
+    grid, start, goal = _maze
+
+    res = get_run(job.algo)(grid, start, goal, _CFG)
+    st = res.stats
+    moves = encode_moves(res.path) if include_paths else ""
+    # Plain tuple: cheapest thing to pickle back to the parent
+    return (job.seed, job.width, job.height, job.algo, res.found, st.expanded, st.visited, st.path_length, moves)
+
+
+def _solve_chunk(jobs: list[BatchJob], include_paths: bool, maze_dir: str | None = None) -> list[tuple]:
+    return [_solve(job, include_paths, maze_dir) for job in jobs]
+
+
+def solve_batch(
+    jobs: Sequence[BatchJob],
+    workers: int | None = None,
+    chunk_size: int | None = None,
+    include_paths: bool = False,
+    maze_dir: str | None = None,
+) -> Iterator[BatchRecord]:
+    # Yields one record per job, in job order, as soon as its chunk is done.
+    # Workers rebuild mazes from the seed, so only BatchJob/tuples cross process boundaries.
+    # With maze_dir they map saved maze files instead (see core.mazefile.cached_maze), so
+    # workers on the same maze share one copy of it in the page cache.
+    for job in jobs:
+        if job.algo not in ALGORITHMS:
+            raise ValueError(f"unknown algorithm {job.algo!r}")
+
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, min(256, len(jobs) // (workers * 4)))
+    chunks = [list(jobs[i:i + chunk_size]) for i in range(0, len(jobs), chunk_size)]
+
+    if workers == 1:
+        for chunk in chunks:
+            for row in _solve_chunk(chunk, include_paths, maze_dir):
+                yield BatchRecord(*row)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for rows in pool.map(_solve_chunk, chunks, [include_paths] * len(chunks), [maze_dir] * len(chunks)):
+            for row in rows:
+                yield BatchRecord(*row)
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m src.batch", description="Solve many seeded mazes in parallel")
+    ap.add_argument("--sizes", nargs="+", default=["51x51"], help="WxH maze sizes")
+    ap.add_argument("--seeds", nargs="+", default=["0-99"], help="seeds or inclusive ranges like 0-999")
+    ap.add_argument("--algos", nargs="+", default=list(ALGORITHMS), choices=list(ALGORITHMS))
+    ap.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    ap.add_argument("--chunk-size", type=int, default=None)
+    ap.add_argument("--paths", action="store_true", help="include the path as R/L/D/U moves")
+    ap.add_argument("--format", choices=("csv", "jsonl"), default="csv")
+    ap.add_argument("--out", help="write records here instead of stdout")
+    ap.add_argument("--maze-dir", help="keep generated mazes here as files and reuse them")
+    args = ap.parse_args(argv)
+
+    jobs = make_jobs([parse_size(s) for s in args.sizes], parse_seeds(args.seeds), args.algos)
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        if args.format == "csv":
+            out.write("seed,width,height,algo,found,expanded,visited,path_length,moves\n")
+        for rec in solve_batch(jobs, args.workers, args.chunk_size, args.paths, args.maze_dir):
+            if args.format == "jsonl":
+                out.write(json.dumps(asdict(rec)) + "\n")
+            else:
+                out.write(
+                    f"{rec.seed},{rec.width},{rec.height},{rec.algo},{int(rec.found)},"
+                    f"{rec.expanded},{rec.visited},{rec.path_length},{rec.moves}\n"
+                )
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+import time
+import tracemalloc
+import zlib
+from dataclasses import asdict, dataclass, fields
+
+from .algorithms.common import AlgorithmConfig
+from .algorithms.registry import ALGORITHMS, RunFn, get_run
+from .cli_args import parse_size
+from .core.grid import FlatGrid, Grid, Pos
+from .core.maze import MAZE_ALGORITHMS, make_maze
+from .core.mazefile import cached_maze
+from .core.result import SearchResult
+
+MODES: dict[str, AlgorithmConfig] = {
+    "quiet": AlgorithmConfig(emit_trace=False),
+    "trace": AlgorithmConfig(emit_trace=True),
+    "compact": AlgorithmConfig(emit_trace=False, compact=True),
+    "packed": AlgorithmConfig(emit_trace=True, packed_trace=True),
+}
+
+# Open-list variants, compared against "compact" (heapq); only A* reads cfg.queue, so
+# they are left out of the default modes
+QUEUE_MODES: dict[str, AlgorithmConfig] = {
+    "indexed": AlgorithmConfig(emit_trace=False, compact=True, queue="indexed"),
+    "bucket": AlgorithmConfig(emit_trace=False, compact=True, queue="bucket"),
+    "bucket-lifo": AlgorithmConfig(emit_trace=False, compact=True, queue="bucket", tie_break="lifo"),
+}
+
+
+@dataclass
+class BenchRecord:
+    size: str
+    seed: int
+    algo: str
+    mode: str
+    found: bool
+    expanded: int
+    visited: int
+    path_length: int
+    trace_events: int
+    wall_s: float
+    expansions_per_s: float
+    peak_kb: float
+    maze: str = "backtracker"
+
+    def key(self) -> tuple:
+        return self.size, self.seed, self.maze, self.algo, self.mode
+
+    def signature(self) -> tuple:
+        return self.found, self.expanded, self.visited, self.path_length
+
+    def describe(self) -> str:
+        return f"{self.size} seed={self.seed} {self.maze} {self.algo}/{self.mode}"
+
+
+@dataclass
+class GenRecord:
+    size: str
+    seed: int
+    generator: str
+    wall_s: float
+    cells_per_s: float
+    peak_kb: float
+    dead_ends: int
+    checksum: int  # crc32 of the wall buffer: same seed must give the same maze
+
+    def key(self) -> tuple:
+        return self.size, self.seed, self.generator
+
+    def signature(self) -> tuple:
+        return (self.checksum,)
+
+    def describe(self) -> str:
+        return f"{self.size} seed={self.seed} generator={self.generator}"
+
+
+def bench_one(
+    run: RunFn, grid: Grid, start: Pos, goal: Pos, cfg: AlgorithmConfig, repeat: int, memory: bool
+) -> tuple[SearchResult, int, float, float]:
+    best = float("inf")
+    events = 0
+    res: SearchResult | None = None
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        res = run(grid, start, goal, cfg)
+        best = min(best, time.perf_counter() - t0)
+        events = len(res.trace)
+        res.trace = []  # don't keep the trace alive across the next measurement
+
+    peak_kb = 0.0
+    if memory:
+        # Separate pass: tracemalloc slows the search down too much to time it
+        tracemalloc.start()
+        res = run(grid, start, goal, cfg)
+        peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+
+    assert res is not None
+    return res, events, best, peak_kb
+
+
+def run_suite(
+    sizes: list[tuple[int, int]],
+    seeds: list[int],
+    algos: list[str],
+    modes: list[str],
+    repeat: int = 3,
+    memory: bool = True,
+    maze: str = "backtracker",
+    maze_dir: str | None = None,
+    **maze_options: float,
+) -> list[BenchRecord]:
+    records: list[BenchRecord] = []
+    for w, h in sizes:
+        for seed in seeds:
+            if maze_dir:
+                m = cached_maze(maze_dir, w, h, seed, maze, **maze_options)
+                grid, start, goal = m.grid, m.start, m.goal
+            else:
+                grid, start, goal = make_maze(w, h, seed, maze, **maze_options)
+            for algo in algos:
+                for mode in modes:
+                    res, events, wall, peak_kb = bench_one(
+                        get_run(algo), grid, start, goal, MODES.get(mode) or QUEUE_MODES[mode], repeat, memory
+                    )
+                    st = res.stats
+                    records.append(BenchRecord(
+                        size=f"{w}x{h}",
+                        seed=seed,
+                        algo=algo,
+                        mode=mode,
+                        found=res.found,
+                        expanded=st.expanded,
+                        visited=st.visited,
+                        path_length=st.path_length,
+                        trace_events=events,
+                        wall_s=round(wall, 6),
+                        expansions_per_s=round(st.expanded / wall, 1) if wall > 0 else 0.0,
+                        peak_kb=round(peak_kb, 1),
+                        maze=maze,
+                    ))
+    return records
+
+
+def count_dead_ends(grid: FlatGrid) -> int:
+    cells = grid.cells
+    nbs = grid.neighbor_ids
+    return sum(1 for i in range(grid.size) if not cells[i] and len(nbs(i)) == 1)
+
+
+def run_gen_suite(
+    sizes: list[tuple[int, int]],
+    seeds: list[int],
+    generators: list[str],
+    repeat: int = 3,
+    memory: bool = True,
+) -> list[GenRecord]:
+    records: list[GenRecord] = []
+    for w, h in sizes:
+        for seed in seeds:
+            for gen in generators:
+                best = float("inf")
+                for _ in range(max(1, repeat)):
+                    t0 = time.perf_counter()
+                    grid, _, _ = make_maze(w, h, seed, gen)
+                    best = min(best, time.perf_counter() - t0)
+
+                peak_kb = 0.0
+                if memory:
+                    del grid
+                    tracemalloc.start()
+                    grid, _, _ = make_maze(w, h, seed, gen)
+                    peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+                    tracemalloc.stop()
+
+                records.append(GenRecord(
+                    size=f"{w}x{h}",
+                    seed=seed,
+                    generator=gen,
+                    wall_s=round(best, 6),
+                    cells_per_s=round(w * h / best, 1) if best > 0 else 0.0,
+                    peak_kb=round(peak_kb, 1),
+                    dead_ends=count_dead_ends(grid),
+                    checksum=zlib.crc32(grid.cells),
+                ))
+    return records
+
+
+def write_records(records: list, fmt: str, out) -> None:
+    if fmt == "json":
+        json.dump([asdict(r) for r in records], out, indent=2)
+        out.write("\n")
+        return
+    if not records:
+        return
+    writer = csv.DictWriter(out, fieldnames=[f.name for f in fields(records[0])])
+    writer.writeheader()
+    for r in records:
+        writer.writerow(asdict(r))
+
+
+def load_records(path: str) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        return [GenRecord(**row) if "generator" in row else BenchRecord(**row) for row in json.load(f)]
+
+
+def compare(records: list, baseline: list, tolerance: float) -> list[str]:
+    # Returns one line per regression: slower than baseline by more than `tolerance`,
+    # or results that no longer match (same maze, same algorithm => same result).
+    base = {r.key(): r for r in baseline}
+    problems: list[str] = []
+    for r in records:
+        b = base.get(r.key())
+        if b is None:
+            continue
+        name = r.describe()
+        if r.signature() != b.signature():
+            problems.append(f"{name}: result changed {b.signature()} -> {r.signature()}")
+        if b.wall_s > 0 and r.wall_s > b.wall_s * (1 + tolerance):
+            problems.append(f"{name}: {b.wall_s:.4f}s -> {r.wall_s:.4f}s (x{r.wall_s / b.wall_s:.2f})")
+    return problems
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m src.bench", description="Headless search benchmark")
+    ap.add_argument("--sizes", nargs="+", default=["51x51", "201x201"], help="WxH maze sizes")
+    ap.add_argument("--seeds", nargs="+", type=int, default=[1, 2, 3])
+    ap.add_argument("--algos", nargs="+", default=list(ALGORITHMS), choices=list(ALGORITHMS))
+    ap.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES) + list(QUEUE_MODES))
+    ap.add_argument("--maze", default="backtracker", choices=MAZE_ALGORITHMS, help="maze generator for searches")
+    ap.add_argument("--braid", type=float, default=0.0, help="chance to remove each dead end")
+    ap.add_argument("--loops", type=float, default=0.0, help="chance to knock out each inner wall")
+    ap.add_argument("--obstacles", type=float, default=0.25, help="obstacle density for --maze open")
+    ap.add_argument("--maze-dir", help="keep generated mazes here as files and reuse them")
+    ap.add_argument("--generators", nargs="+", choices=MAZE_ALGORITHMS, metavar="GEN",
+                    help="benchmark maze generation with these generators instead of searches")
+    ap.add_argument("--repeat", type=int, default=3, help="timed runs per case (best is kept)")
+    ap.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory pass")
+    ap.add_argument("--format", choices=("csv", "json"), default="csv")
+    ap.add_argument("--out", help="write results here instead of stdout")
+    ap.add_argument("--save-baseline", metavar="PATH", help="store results as a JSON baseline")
+    ap.add_argument("--baseline", metavar="PATH", help="compare against a saved JSON baseline")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline")
+    args = ap.parse_args(argv)
+
+    sizes = [parse_size(s) for s in args.sizes]
+    records: list
+    if args.generators:
+        records = run_gen_suite(sizes, args.seeds, args.generators, args.repeat, not args.no_memory)
+    else:
+        records = run_suite(
+            sizes=sizes,
+            seeds=args.seeds,
+            algos=args.algos,
+            modes=args.modes,
+            repeat=args.repeat,
+            memory=not args.no_memory,
+            maze=args.maze,
+            maze_dir=args.maze_dir,
+            braid=args.braid,
+            loop_density=args.loops,
+            obstacle_density=args.obstacles,
+        )
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8", newline="") as f:
+            write_records(records, args.format, f)
+    else:
+        write_records(records, args.format, sys.stdout)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            write_records(records, "json", f)
+
+    if args.baseline:
+        problems = compare(records, load_records(args.baseline), args.tolerance)
+        for line in problems:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if problems:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+# Argument parsers shared by the command-line tools (bench, batch, headless). Kept free
+# of imports so a tool only pays for the modules it actually runs.
+
+
+def parse_size(text: str) -> tuple[int, int]:
+    # "51x31", or "51" for a square maze
+    w, _, h = text.lower().partition("x")
+    return int(w), int(h or w)
+
+
+def parse_seeds(items: list[str]) -> list[int]:
+    # "7", "0-999" (inclusive)
+    seeds: list[int] = []
+    for item in items:
+        lo, sep, hi = item.partition("-")
+        if sep:
+            seeds.extend(range(int(lo), int(hi) + 1))
+        else:
+            seeds.append(int(item))
+    return seeds
@@ -3,6 +3,8 @@ from __future__ import annotations
 # App
 APP_TITLE = "Wrath of the Path"
 FPS = 60
+CACHED_RENDERER = True  # repaint only changed cells (dirty rects) instead of the whole grid
+FONT_PATH = None  # .ttf for UI text; None = pygame's bundled default font (no system font scan)
 
 # Grid
 GRID_W = 50
@@ -25,5 +27,13 @@ GOAL_POS = (GRID_W - 2, GRID_H - 2)
 SEARCH_STEP_DELAY_MS = 8
 PLAYER_STEP_DELAY_MS = 35
 
+# Crowd (many agents routing to the goal)
+CROWD_SIZE = 2000  # agents per "Spawn Crowd" click, at random open cells
+CROWD_STEP_DELAY_MS = PLAYER_STEP_DELAY_MS
+
 # Maze generation
 MAZE_SEED = None
+MAZE_ALGORITHM = "backtracker"  # backtracker | kruskal | prim | eller | wilson | open
+MAZE_BRAID = 0.0  # 0..1, fraction of dead ends removed (multi-path maze)
+MAZE_LOOP_DENSITY = 0.0  # 0..1, extra wall segments knocked out
+MAZE_OBSTACLE_DENSITY = 0.25  # only for "open"
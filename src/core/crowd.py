@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from ..algorithms import field as fields
+from ..algorithms.field import DistanceField
+from ..utils.timing import StepTimer
+from .grid import FlatGrid, Pos
+
+# Many agents moving in lockstep. Agents heading to the same goal share one reverse
+# distance field and are kept as stacks (cell -> number of agents standing there): a step
+# moves every stack to its parent cell, and stacks that land on the same cell merge. A
+# step therefore costs O(distinct occupied cells), not O(agents), and agents converging
+# on the same corridors cost almost nothing extra. Per-agent positions are only worked
+# out when asked for (or when the walls change), by replaying the steps on the field.
+
+
+@dataclass
+class AgentGroup:
+    goal: Pos
+    distances: DistanceField
+    version: int  # grid.version the field was built for
+    stacks: dict[int, int] = field(default_factory=dict)  # cell -> agents on their way
+    stuck: dict[int, int] = field(default_factory=dict)  # cell -> agents that can't reach the goal
+    agents: array = field(default_factory=lambda: array("i"))
+    arrived: int = 0
+
+
+class Crowd:
+    def __init__(self, grid: FlatGrid, step_delay_ms: int = 35) -> None:
+        self.grid = grid
+        self.timer = StepTimer(step_delay_ms=step_delay_ms)
+        self.ticks = 0
+        self.groups: dict[Pos, AgentGroup] = {}
+        # Per agent: last known cell and the tick it was known at; goal via _goal_of
+        self._pos = array("i")
+        self._synced = array("i")
+        self._goal_of: list[Pos] = []
+
+    def __len__(self) -> int:
+        return len(self._pos)
+
+    @property
+    def arrived(self) -> int:
+        return sum(g.arrived for g in self.groups.values())
+
+    @property
+    def active(self) -> int:
+        # Agents still walking (stuck ones excluded)
+        return sum(sum(g.stacks.values()) for g in self.groups.values())
+
+    def spawn(self, start: Pos, goal: Pos, count: int = 1) -> range:
+        # Adds `count` agents at start, all heading to goal; returns their ids
+        group = self._group(goal)
+        cell = self.grid.index(start)
+        first = len(self._pos)
+        for _ in range(count):
+            group.agents.append(len(self._pos))
+            self._pos.append(cell)
+            self._synced.append(self.ticks)
+            self._goal_of.append(goal)
+        self._place(group, cell, count)
+        return range(first, first + count)
+
+    def update(self, dt_ms: int) -> int:
+        # Advances as many steps as the elapsed time allows; returns how many
+        self.timer.update(dt_ms)
+        steps = 0
+        while self.timer.is_ready():
+            self.step()
+            self.timer.consume()
+            steps += 1
+        return steps
+
+    def step(self) -> None:
+        version = self.grid.version
+        for group in self.groups.values():
+            if group.version != version:
+                self._rebuild(group)
+            if not group.stacks:
+                continue
+            parent = group.distances.parent
+            goal = self.grid.index(group.goal)
+            moved: dict[int, int] = {}
+            for cell, count in group.stacks.items():
+                nxt = parent[cell]
+                if nxt == goal:
+                    group.arrived += count
+                else:
+                    moved[nxt] = moved.get(nxt, 0) + count
+            group.stacks = moved
+        self.ticks += 1
+
+    def position(self, agent: int) -> Pos:
+        group = self.groups[self._goal_of[agent]]
+        cell = self._advance(group, agent)
+        return cell % self.grid.width, cell // self.grid.width
+
+    def occupied(self) -> Iterator[tuple[Pos, int]]:
+        # (cell, agents there) for every occupied cell, for batched drawing
+        w = self.grid.width
+        for group in self.groups.values():
+            for stacks in (group.stacks, group.stuck):
+                for cell, count in stacks.items():
+                    yield (cell % w, cell // w), count
+
+    # -- internals --
+
+    def _group(self, goal: Pos) -> AgentGroup:
+        group = self.groups.get(goal)
+        if group is None:
+            group = AgentGroup(goal, fields.shared(self.grid, goal), self.grid.version)
+            self.groups[goal] = group
+        elif group.version != self.grid.version:
+            self._rebuild(group)
+        return group
+
+    def _place(self, group: AgentGroup, cell: int, count: int) -> None:
+        if cell == self.grid.index(group.goal):
+            group.arrived += count
+        elif group.distances.parent[cell] < 0:
+            group.stuck[cell] = group.stuck.get(cell, 0) + count
+        else:
+            group.stacks[cell] = group.stacks.get(cell, 0) + count
+
+    def _advance(self, group: AgentGroup, agent: int) -> int:
+        # Replays the steps since the agent was last synced (same rule as step())
+        parent = group.distances.parent
+        goal = self.grid.index(group.goal)
+        cell = self._pos[agent]
+        for _ in range(self.ticks - self._synced[agent]):
+            if cell == goal or parent[cell] < 0:
+                break
+            cell = parent[cell]
+        self._pos[agent] = cell
+        self._synced[agent] = self.ticks
+        return cell
+
+    def _rebuild(self, group: AgentGroup) -> None:
+        # Walls changed: pin every agent down on the old field, then re-stack on a new one
+        for agent in group.agents:
+            self._advance(group, agent)
+        group.distances = fields.shared(self.grid, group.goal)
+        group.version = self.grid.version
+        group.stacks = {}
+        group.stuck = {}
+        group.arrived = 0
+        for agent in group.agents:
+            self._place(group, self._pos[agent], 1)
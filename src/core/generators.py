@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import random
+from array import array
+from typing import Iterator
+
+from .grid import FlatGrid
+
+# Alternative perfect-maze generators. Like the backtracker they carve on the odd lattice
+# (cells at odd x/y, passages in between) straight into FlatGrid.cells, which must be all
+# walls on entry. Lattice cell (cx, cy) lives at grid (2 * cx + 1, 2 * cy + 1).
+
+
+def lattice_size(width: int, height: int) -> tuple[int, int]:
+    return (width - 1) // 2, (height - 1) // 2
+
+
+def _grid_ids(grid: FlatGrid) -> array:
+    # grid cell id for every lattice cell, row-major
+    w = grid.width
+    cw, ch = lattice_size(w, grid.height)
+    return array("i", [(2 * cy + 1) * w + 2 * cx + 1 for cy in range(ch) for cx in range(cw)])
+
+
+def kruskal(grid: FlatGrid, start_cell: int, rnd: random.Random) -> None:
+    # Random edge order + union-find (path halving, union by size)
+    cw, ch = lattice_size(grid.width, grid.height)
+    n = cw * ch
+    if n == 0:
+        return
+    gid = _grid_ids(grid)
+    cells = grid.cells
+    for i in gid:
+        cells[i] = 0
+
+    # edge e: even = cell e >> 1 to its right neighbor, odd = to the one below
+    edges = [2 * c for c in range(n) if c % cw != cw - 1]
+    edges += [2 * c + 1 for c in range(n - cw)]
+    rnd.shuffle(edges)
+
+    parent = array("i", range(n))
+    size = array("i", [1]) * n
+
+    def find(a: int) -> int:
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    joined = 1
+    for e in edges:
+        a = e >> 1
+        b = a + cw if e & 1 else a + 1
+        ra, rb = find(a), find(b)
+        if ra == rb:
+            continue
+        if size[ra] < size[rb]:
+            ra, rb = rb, ra
+        parent[rb] = ra
+        size[ra] += size[rb]
+        cells[(gid[a] + gid[b]) >> 1] = 0
+        joined += 1
+        if joined == n:
+            break
+
+
+def prim(grid: FlatGrid, start_cell: int, rnd: random.Random) -> None:
+    # Randomized Prim: grow from the start cell, attaching a random frontier cell each step
+    cw, ch = lattice_size(grid.width, grid.height)
+    n = cw * ch
+    if n == 0:
+        return
+    gid = _grid_ids(grid)
+    cells = grid.cells
+    state = bytearray(n)  # 0 = outside, 1 = frontier, 2 = in maze
+    frontier: list[int] = []
+
+    def add(c: int) -> None:
+        state[c] = 2
+        cells[gid[c]] = 0
+        x = c % cw
+        for nb, ok in ((c + 1, x + 1 < cw), (c - 1, x > 0), (c + cw, c + cw < n), (c - cw, c >= cw)):
+            if ok and state[nb] == 0:
+                state[nb] = 1
+                frontier.append(nb)
+
+    add(start_cell)
+    while frontier:
+        i = rnd.randrange(len(frontier))
+        c = frontier[i]
+        frontier[i] = frontier[-1]
+        frontier.pop()
+
+        x = c % cw
+        inside = [nb for nb, ok in ((c + 1, x + 1 < cw), (c - 1, x > 0), (c + cw, c + cw < n), (c - cw, c >= cw))
+                  if ok and state[nb] == 2]
+        nb = rnd.choice(inside)
+        cells[(gid[c] + gid[nb]) >> 1] = 0
+        add(c)
+
+
+def wilson(grid: FlatGrid, start_cell: int, rnd: random.Random) -> None:
+    # Loop-erased random walks: uniform spanning tree. `step` keeps only the last exit
+    # taken from each cell, which erases loops without storing the walk itself.
+    cw, ch = lattice_size(grid.width, grid.height)
+    n = cw * ch
+    if n == 0:
+        return
+    gid = _grid_ids(grid)
+    cells = grid.cells
+    in_maze = bytearray(n)
+    step = array("i", bytes(4 * n))
+
+    in_maze[start_cell] = 1
+    cells[gid[start_cell]] = 0
+
+    for c0 in range(n):
+        if in_maze[c0]:
+            continue
+        c = c0
+        while not in_maze[c]:
+            x = c % cw
+            opts = [nb for nb, ok in ((c + 1, x + 1 < cw), (c - 1, x > 0), (c + cw, c + cw < n), (c - cw, c >= cw))
+                    if ok]
+            nb = rnd.choice(opts)
+            step[c] = nb
+            c = nb
+        c = c0
+        while not in_maze[c]:
+            in_maze[c] = 1
+            nb = step[c]
+            cells[gid[c]] = 0
+            cells[(gid[c] + gid[nb]) >> 1] = 0
+            c = nb
+
+
+def eller_rows(width: int, rnd: random.Random, lattice_rows: int | None = None) -> Iterator[bytearray]:
+    # Eller's algorithm, one grid row at a time (1 = wall), with O(width) state.
+    # Yields the top border, then a cell row and a connector row per lattice row.
+    # With lattice_rows=None the stream never ends; otherwise the last cell row is closed
+    # off (all sets merged) and the stream stops there.
+    cw = (width - 1) // 2
+    yield bytearray(b"\x01") * width
+    if cw == 0:
+        return
+
+    sets = list(range(cw))
+    r = 0
+    while lattice_rows is None or r < lattice_rows:
+        last = lattice_rows is not None and r == lattice_rows - 1
+
+        # Set ids are relabeled to < cw every row, so a flat union-find covers the row
+        parent = list(range(cw))
+
+        def find(a: int) -> int:
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            return a
+
+        row = bytearray(b"\x01") * width
+        row[1] = 0
+        for cx in range(cw - 1):
+            gx = 2 * cx + 1
+            row[gx + 2] = 0
+            a, b = find(sets[cx]), find(sets[cx + 1])
+            if a != b and (last or rnd.random() < 0.5):
+                parent[b] = a
+                row[gx + 1] = 0
+        sets = [find(s) for s in sets]
+        yield row
+
+        if last:
+            return
+
+        # Every set continues downward through at least one cell
+        groups: dict[int, list[int]] = {}
+        for cx, s in enumerate(sets):
+            groups.setdefault(s, []).append(cx)
+        down = bytearray(cw)
+        for members in groups.values():
+            picked = False
+            for cx in members:
+                if rnd.random() < 0.5:
+                    down[cx] = 1
+                    picked = True
+            if not picked:
+                down[rnd.choice(members)] = 1
+
+        conn = bytearray(b"\x01") * width
+        # Next row: carried cells keep their set, the rest get fresh ids; then relabel to < cw
+        fresh = 2 * cw
+        nxt: list[int] = []
+        for cx in range(cw):
+            if down[cx]:
+                conn[2 * cx + 1] = 0
+                nxt.append(sets[cx])
+            else:
+                nxt.append(fresh)
+                fresh += 1
+        labels: dict[int, int] = {}
+        sets = [labels.setdefault(s, len(labels)) for s in nxt]
+        yield conn
+        r += 1
+
+
+def eller(grid: FlatGrid, start_cell: int, rnd: random.Random) -> None:
+    w, h = grid.width, grid.height
+    _, ch = lattice_size(w, h)
+    cells = grid.cells
+    y = 0
+    for row in eller_rows(w, rnd, ch):
+        cells[y * w:(y + 1) * w] = row
+        y += 1
+
+
+def open_field(grid: FlatGrid, rnd: random.Random, density: float) -> None:
+    # No maze at all: every cell is an obstacle with probability `density`
+    rand = rnd.random
+    grid.cells[:] = bytes(1 if rand() < density else 0 for _ in range(grid.size))
+
+
+def _lattice_nbs(grid: FlatGrid, i: int) -> list[int]:
+    # Lattice neighbors (two steps away) that stay inside the border
+    w = grid.width
+    y, x = divmod(i, w)
+    out: list[int] = []
+    if x + 2 < w - 1:
+        out.append(i + 2)
+    if x >= 3:
+        out.append(i - 2)
+    if y + 2 < grid.height - 1:
+        out.append(i + 2 * w)
+    if y >= 3:
+        out.append(i - 2 * w)
+    return out
+
+
+def _open_degree(grid: FlatGrid, i: int) -> int:
+    w = grid.width
+    c = grid.cells
+    y, x = divmod(i, w)
+    return ((x + 1 < w and not c[i + 1]) + (x > 0 and not c[i - 1])
+            + (y + 1 < grid.height and not c[i + w]) + (y > 0 and not c[i - w]))
+
+
+def braid(grid: FlatGrid, rnd: random.Random, density: float) -> None:
+    # Removes each dead end with probability `density` by knocking out one of its walls,
+    # preferring a wall that also fixes a neighboring dead end.
+    cells = grid.cells
+    for i in _grid_ids(grid):
+        if cells[i] or _open_degree(grid, i) != 1 or rnd.random() >= density:
+            continue
+        walled = [nb for nb in _lattice_nbs(grid, i) if cells[(i + nb) >> 1] and not cells[nb]]
+        if not walled:
+            continue
+        dead = [nb for nb in walled if _open_degree(grid, nb) == 1]
+        nb = rnd.choice(dead or walled)
+        cells[(i + nb) >> 1] = 0
+
+
+def add_loops(grid: FlatGrid, rnd: random.Random, density: float) -> None:
+    # Knocks out each remaining wall segment between two open lattice cells with
+    # probability `density`, turning the perfect maze into a multi-path one.
+    cells = grid.cells
+    rand = rnd.random
+    for i in _grid_ids(grid):
+        if cells[i]:
+            continue
+        for nb in _lattice_nbs(grid, i):
+            if nb > i and not cells[nb] and cells[(i + nb) >> 1] and rand() < density:
+                cells[(i + nb) >> 1] = 0
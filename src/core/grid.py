@@ -1,9 +1,22 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable
+from array import array
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, TypeVar
 
 Pos = tuple[int, int]
+T = TypeVar("T")
+
+MAX_COST = 255  # step costs are stored one byte per cell
+
+
+def _check_costs(costs: Iterable[int], n: int) -> bytearray:
+    out = bytearray(costs)
+    if len(out) != n:
+        raise ValueError(f"expected {n} costs, got {len(out)}")
+    if 0 in out:
+        raise ValueError("costs must be 1..255 (a blocked cell is a wall)")
+    return out
 
 
 @dataclass
@@ -11,6 +24,11 @@ class Grid:
     width: int
     height: int
     walls: list[list[bool]]  # True = wall, False = walkable
+    version: int = field(default=0, compare=False, repr=False)  # bumped by set_wall()/set_cost()
+    # Terrain: cost of stepping onto each cell (index y * width + x), None = every step costs 1.
+    # Read by the cost-aware searches (dijkstra, astar); the others only see walls.
+    costs: bytearray | None = field(default=None, repr=False)
+    _memo: dict[str, tuple[int, object]] = field(default_factory=dict, init=False, compare=False, repr=False)
 
     @classmethod
     def filled(cls, width: int, height: int, wall: bool = True) -> "Grid":
@@ -28,13 +46,305 @@ class Grid:
     def set_wall(self, p: Pos, value: bool) -> None:
         x, y = p
         self.walls[y][x] = value
+        self.version += 1
 
     def is_walkable(self, p: Pos) -> bool:
         return self.in_bounds(p) and (not self.is_wall(p))
 
+    def cost(self, p: Pos) -> int:
+        c = self.costs
+        return 1 if c is None else c[p[1] * self.width + p[0]]
+
+    def set_cost(self, p: Pos, value: int) -> None:
+        if not 1 <= value <= MAX_COST:
+            raise ValueError(f"cost must be 1..{MAX_COST}, got {value}")
+        if self.costs is None:
+            if value == 1:
+                return
+            self.costs = bytearray(b"\x01") * (self.width * self.height)
+        i = p[1] * self.width + p[0]
+        self.costs[i] = value
+        self._changed(i, wall=False)
+
+    def set_costs(self, costs: Iterable[int] | None) -> None:
+        # Replaces the whole cost layer; None goes back to uniform cost
+        self.costs = None if costs is None else _check_costs(costs, self.width * self.height)
+        self._changed(-1, wall=False)
+
+    def path_cost(self, path: list[Pos]) -> int:
+        # Sum of the costs of every cell entered after the first
+        c = self.costs
+        if c is None:
+            return max(0, len(path) - 1)
+        w = self.width
+        return sum(c[y * w + x] for x, y in path[1:])
+
+    def _changed(self, i: int, wall: bool = True) -> None:
+        self.version += 1
+
+    def derived(self, key: str, build: Callable[["Grid"], T]) -> T:
+        # Data computed from the grid, kept while `version` stays put (so edits must go
+        # through set_wall()/set_cost(), not walls[y][x] = ...)
+        hit = self._memo.get(key)
+        if hit is not None and hit[0] == self.version:
+            return hit[1]  # type: ignore[return-value]
+        value = build(self)
+        self._memo[key] = (self.version, value)
+        return value
+
     def neighbors4(self, p: Pos) -> Iterable[Pos]:
         x, y = p
         candidates = ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))
         for q in candidates:
             if self.is_walkable(q):
                 yield q
+
+
+class _WallRow:
+    __slots__ = ("_grid", "_base")
+
+    def __init__(self, grid: "FlatGrid", y: int) -> None:
+        self._grid = grid
+        self._base = y * grid.width
+
+    def __len__(self) -> int:
+        return self._grid.width
+
+    def __getitem__(self, x: int) -> bool:
+        w = self._grid.width
+        if x < 0:
+            x += w
+        if not 0 <= x < w:
+            raise IndexError("row index out of range")
+        return self._grid.cells[self._base + x] != 0
+
+    def __setitem__(self, x: int, value: bool) -> None:
+        w = self._grid.width
+        if x < 0:
+            x += w
+        if not 0 <= x < w:
+            raise IndexError("row index out of range")
+        self._grid.set_wall_id(self._base + x, value)
+
+    def __iter__(self) -> Iterator[bool]:
+        c = self._grid.cells
+        for i in range(self._base, self._base + self._grid.width):
+            yield c[i] != 0
+
+
+class _WallRows:
+    __slots__ = ("_grid",)
+
+    def __init__(self, grid: "FlatGrid") -> None:
+        self._grid = grid
+
+    def __len__(self) -> int:
+        return self._grid.height
+
+    def __getitem__(self, y: int) -> _WallRow:
+        h = self._grid.height
+        if y < 0:
+            y += h
+        if not 0 <= y < h:
+            raise IndexError("grid index out of range")
+        return _WallRow(self._grid, y)
+
+    def __iter__(self) -> Iterator[_WallRow]:
+        for y in range(self._grid.height):
+            yield _WallRow(self._grid, y)
+
+
+class FlatGrid(Grid):
+    # Compact backend: one byte per cell, index = y * width + x.
+    # `walls[y][x]` still works (through a view), so existing code runs unchanged.
+
+    def __init__(
+        self, width: int, height: int, cells: bytearray | memoryview | None = None, costs: Iterable[int] | None = None
+    ) -> None:
+        if cells is None:
+            cells = bytearray(width * height)
+        if len(cells) != width * height:
+            raise ValueError(f"expected {width * height} cells, got {len(cells)}")
+        self.width = width
+        self.height = height
+        self.cells = cells  # 1 = wall, 0 = walkable; a memoryview when mapped from a file
+        self.costs = None if costs is None else _check_costs(costs, width * height)
+        self.version = 0  # bumped on every set_wall()/fill()
+        self._adj: tuple[array, array] | None = None
+        self._derived: dict[str, object] = {}
+
+    @property
+    def walls(self) -> _WallRows:  # type: ignore[override]
+        return _WallRows(self)
+
+    @classmethod
+    def filled(cls, width: int, height: int, wall: bool = True) -> "FlatGrid":
+        return cls(width, height, bytearray(b"\x01" if wall else b"\x00") * (width * height))
+
+    @classmethod
+    def from_grid(cls, grid: Grid) -> "FlatGrid":
+        if isinstance(grid, FlatGrid):
+            return cls(grid.width, grid.height, bytearray(grid.cells), grid.costs)
+        cells = bytearray(1 if w else 0 for row in grid.walls for w in row)
+        return cls(grid.width, grid.height, cells, grid.costs)
+
+    @classmethod
+    def open(cls, path: str) -> "FlatGrid":
+        # Grid from a maze file (see core.mazefile; open_maze() also returns start/goal/seed)
+        from .mazefile import open_maze
+
+        return open_maze(path).grid
+
+    def to_grid(self) -> Grid:
+        w = self.width
+        c = self.cells
+        walls = [[c[y * w + x] != 0 for x in range(w)] for y in range(self.height)]
+        costs = None if self.costs is None else bytearray(self.costs)
+        return Grid(width=w, height=self.height, walls=walls, costs=costs)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FlatGrid):
+            return (self.width, self.height, self.cells, self.costs) == (
+                other.width, other.height, other.cells, other.costs
+            )
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"FlatGrid(width={self.width}, height={self.height})"
+
+    @property
+    def size(self) -> int:
+        return self.width * self.height
+
+    def index(self, p: Pos) -> int:
+        return p[1] * self.width + p[0]
+
+    def pos(self, i: int) -> Pos:
+        y, x = divmod(i, self.width)
+        return x, y
+
+    def fill(self, wall: bool) -> None:
+        self.cells[:] = (b"\x01" if wall else b"\x00") * len(self.cells)
+        self._changed(-1)
+
+    def is_wall(self, p: Pos) -> bool:
+        x, y = p
+        return self.cells[y * self.width + x] != 0
+
+    def set_wall(self, p: Pos, value: bool) -> None:
+        x, y = p
+        self.set_wall_id(y * self.width + x, value)
+
+    def set_wall_id(self, i: int, value: bool) -> None:
+        self.cells[i] = 1 if value else 0
+        self._changed(i)
+
+    def is_walkable(self, p: Pos) -> bool:
+        x, y = p
+        return 0 <= x < self.width and 0 <= y < self.height and not self.cells[y * self.width + x]
+
+    def neighbors4(self, p: Pos) -> list[Pos]:
+        # Same order as Grid.neighbors4: +x, -x, +y, -y
+        x, y = p
+        w = self.width
+        c = self.cells
+        i = y * w + x
+        out: list[Pos] = []
+        if x + 1 < w and not c[i + 1]:
+            out.append((x + 1, y))
+        if x > 0 and not c[i - 1]:
+            out.append((x - 1, y))
+        if y + 1 < self.height and not c[i + w]:
+            out.append((x, y + 1))
+        if y > 0 and not c[i - w]:
+            out.append((x, y - 1))
+        return out
+
+    def neighbor_ids(self, i: int) -> list[int]:
+        # Moves out of open cell i (a wall has none), from adjacency() if it is cached
+        adj = self._adj
+        if adj is not None:
+            offsets, targets = adj
+            return targets[offsets[i]:offsets[i + 1]].tolist()
+        if self.cells[i]:
+            return []
+        return self.open_around(i)
+
+    def open_around(self, i: int) -> list[int]:
+        # Open 4-neighbors of any cell, a wall included, never from the cache: for code
+        # that looks around a cell that was just walled (D* Lite repairs)
+        w = self.width
+        c = self.cells
+        y, x = divmod(i, w)
+        out: list[int] = []
+        if x + 1 < w and not c[i + 1]:
+            out.append(i + 1)
+        if x > 0 and not c[i - 1]:
+            out.append(i - 1)
+        if y + 1 < self.height and not c[i + w]:
+            out.append(i + w)
+        if y > 0 and not c[i - w]:
+            out.append(i - w)
+        return out
+
+    def adjacency(self) -> tuple[array, array]:
+        # CSR neighbor table (offsets, targets), cached until a wall changes.
+        if self._adj is None:
+            self._adj = self._build_adjacency()
+        return self._adj
+
+    def _changed(self, i: int, wall: bool = True) -> None:
+        # Cell i changed (-1 = all of them). A wall change drops the adjacency table and
+        # all derived data except what a wall_changed(i) hook patches (returning True).
+        # A cost change leaves walls - and so adjacency and derived data - alone, except
+        # for data with a cost_changed(i) hook, which stays only if that returns True.
+        self.version += 1
+        if wall:
+            self._adj = None
+        if self._derived:
+            hook = "wall_changed" if wall else "cost_changed"
+            kept: dict[str, object] = {}
+            for k, v in self._derived.items():
+                f = getattr(v, hook, None)
+                if f(i) if f is not None else not wall:
+                    kept[k] = v
+            self._derived = kept
+
+    def derived(self, key: str, build: Callable[["FlatGrid"], T]) -> T:
+        # Per-grid cache for precomputed search data (jump tables, cluster graphs, ...),
+        # see _changed(). Code that writes `cells` directly must call fill()/set_wall_id().
+        try:
+            return self._derived[key]  # type: ignore[return-value]
+        except KeyError:
+            value = self._derived[key] = build(self)
+            return value
+
+    def forget(self, key: str) -> None:
+        self._derived.pop(key, None)
+
+    def _build_adjacency(self) -> tuple[array, array]:
+        w, h = self.width, self.height
+        c = self.cells
+        n = w * h
+        offsets = array("i", bytes(4 * (n + 1)))
+        targets = array("i")
+        push = targets.append
+        i = 0
+        for y in range(h):
+            has_up = y > 0
+            has_down = y + 1 < h
+            for x in range(w):
+                if not c[i]:
+                    if x + 1 < w and not c[i + 1]:
+                        push(i + 1)
+                    if x > 0 and not c[i - 1]:
+                        push(i - 1)
+                    if has_down and not c[i + w]:
+                        push(i + w)
+                    if has_up and not c[i - w]:
+                        push(i - w)
+                i += 1
+                offsets[i] = len(targets)
+        return offsets, targets
@@ -1,34 +1,48 @@
 from __future__ import annotations
 
 import random
+from array import array
 from dataclasses import dataclass
 
-from .grid import Grid, Pos
+from . import generators
+from .grid import FlatGrid, Grid, Pos
+
+MAZE_ALGORITHMS = ("backtracker", "kruskal", "prim", "eller", "wilson", "open")
 
 
 @dataclass(frozen=True)
 class MazeConfig:
     seed: int | None = None
+    algorithm: str = "backtracker"  # one of MAZE_ALGORITHMS
+    braid: float = 0.0  # chance to remove each dead end (0 = perfect maze, 1 = no dead ends)
+    loop_density: float = 0.0  # chance to knock out each remaining wall between two cells
+    obstacle_density: float = 0.25  # "open": chance for each cell to be an obstacle
 
 
 class MazeGenerator:
 
     @staticmethod
     def generate(grid: Grid, start: Pos, goal: Pos, cfg: MazeConfig | None = None) -> None:
-        rnd = random.Random(cfg.seed if cfg else None)
+        cfg = cfg or MazeConfig()
+        rnd = random.Random(cfg.seed)
+        if cfg.algorithm not in MAZE_ALGORITHMS:
+            raise ValueError(
+                f"unknown maze algorithm {cfg.algorithm!r} (expected one of {', '.join(MAZE_ALGORITHMS)})"
+            )
+
+        if cfg.algorithm != "backtracker" or cfg.braid > 0 or cfg.loop_density > 0:
+            MazeGenerator._generate_alt(grid, start, goal, cfg, rnd)
+            return
+
+        if isinstance(grid, FlatGrid):
+            MazeGenerator._generate_flat(grid, start, goal, rnd)
+            return
 
         for y in range(grid.height):
             for x in range(grid.width):
                 grid.walls[y][x] = True
 
-        def clamp_odd(v: int, max_v: int) -> int:
-            v = max(1, min(v, max_v - 2))
-            if v % 2 == 0:
-                v = v - 1 if v > 1 else v + 1
-            return max(1, min(v, max_v - 2))
-
-        sx, sy = clamp_odd(start[0], grid.width), clamp_odd(start[1], grid.height)
-        gx, gy = clamp_odd(goal[0], grid.width), clamp_odd(goal[1], grid.height)
+        sx, sy = _clamp_odd(start[0], grid.width), _clamp_odd(start[1], grid.height)
 
         cell_stack: list[Pos] = [(sx, sy)]
         visited_cells: set[Pos] = {(sx, sy)}
@@ -61,15 +75,109 @@ class MazeGenerator:
             visited_cells.add(nxt)
             cell_stack.append(nxt)
 
-        grid.set_wall(start, False)
-        grid.set_wall(goal, False)
+        _open_endpoints(grid, start, goal, rnd)
+
+    @staticmethod
+    def _generate_flat(grid: FlatGrid, start: Pos, goal: Pos, rnd: random.Random) -> None:
+        MazeGenerator._carve_backtracker(grid, start, rnd)
+        _open_endpoints(grid, start, goal, rnd)
+
+    @staticmethod
+    def _carve_backtracker(grid: FlatGrid, start: Pos, rnd: random.Random) -> None:
+        # Same recursive backtracker, carving straight into the byte buffer with int ids.
+        # Candidate cells share the start cell's parity and passages never do, so a candidate
+        # is unvisited exactly when it is still a wall: the wall buffer doubles as `visited`.
+        # Neighbor order and rnd.choice calls match generate(), so a seed gives the same maze.
+        w, h = grid.width, grid.height
+        grid.fill(True)
+        cells = grid.cells
+
+        sx, sy = _clamp_odd(start[0], w), _clamp_odd(start[1], h)
+        max_x, max_y = w - 1, h - 1
+        w2 = 2 * w
+
+        s = sy * w + sx
+        cells[s] = 0
+        stack = array("i", [s] if 1 <= sx < max_x and 1 <= sy < max_y else [])
+        choice = rnd.choice
+
+        while stack:
+            cur = stack[-1]
+            y, x = divmod(cur, w)
+            nbs: list[int] = []
+            if x + 2 < max_x and cells[cur + 2]:
+                nbs.append(cur + 2)
+            if x >= 3 and cells[cur - 2]:
+                nbs.append(cur - 2)
+            if y + 2 < max_y and cells[cur + w2]:
+                nbs.append(cur + w2)
+            if y >= 3 and cells[cur - w2]:
+                nbs.append(cur - w2)
+            if not nbs:
+                stack.pop()
+                continue
+
+            nxt = choice(nbs)
+            cells[(cur + nxt) >> 1] = 0
+            cells[nxt] = 0
+            stack.append(nxt)
 
-        for p in (start, goal):
-            if not grid.is_walkable(p):
-                grid.set_wall(p, False)
-            if all(grid.is_wall(q) for q in _neighbors_in_bounds(grid, p)):
-                q = rnd.choice(_neighbors_in_bounds(grid, p))
-                grid.set_wall(q, False)
+    @staticmethod
+    def _generate_alt(grid: Grid, start: Pos, goal: Pos, cfg: MazeConfig, rnd: random.Random) -> None:
+        fg = grid if isinstance(grid, FlatGrid) else FlatGrid(grid.width, grid.height)
+        fg.fill(True)
+
+        if cfg.algorithm == "open":
+            generators.open_field(fg, rnd, cfg.obstacle_density)
+        else:
+            if cfg.algorithm == "backtracker":
+                MazeGenerator._carve_backtracker(fg, start, rnd)
+            else:
+                cw, _ = generators.lattice_size(fg.width, fg.height)
+                sx, sy = _clamp_odd(start[0], fg.width), _clamp_odd(start[1], fg.height)
+                start_cell = (sy // 2) * cw + sx // 2
+                getattr(generators, cfg.algorithm)(fg, start_cell, rnd)
+            # Loop injection for multi-path workloads
+            if cfg.braid > 0:
+                generators.braid(fg, rnd, cfg.braid)
+            if cfg.loop_density > 0:
+                generators.add_loops(fg, rnd, cfg.loop_density)
+
+        if fg is not grid:
+            for y, row in enumerate(fg.walls):
+                grid.walls[y][:] = list(row)
+        _open_endpoints(grid, start, goal, rnd)
+
+
+def _clamp_odd(v: int, max_v: int) -> int:
+    v = max(1, min(v, max_v - 2))
+    if v % 2 == 0:
+        v = v - 1 if v > 1 else v + 1
+    return max(1, min(v, max_v - 2))
+
+
+def _open_endpoints(grid: Grid, start: Pos, goal: Pos, rnd: random.Random) -> None:
+    grid.set_wall(start, False)
+    grid.set_wall(goal, False)
+
+    for p in (start, goal):
+        if not grid.is_walkable(p):
+            grid.set_wall(p, False)
+        if all(grid.is_wall(q) for q in _neighbors_in_bounds(grid, p)):
+            q = rnd.choice(_neighbors_in_bounds(grid, p))
+            grid.set_wall(q, False)
+
+
+def make_maze(
+    width: int, height: int, seed: int | None, algorithm: str = "backtracker", **options: float
+) -> tuple[FlatGrid, Pos, Pos]:
+    # Maze with the default corner-to-corner start/goal, as used by headless tools.
+    # `options` are the remaining MazeConfig fields (braid, loop_density, obstacle_density).
+    grid = FlatGrid.filled(width, height, wall=True)
+    start, goal = (1, 1), (width - 2, height - 2)
+    cfg = MazeConfig(seed=seed, algorithm=algorithm, **options)
+    MazeGenerator.generate(grid, start=start, goal=goal, cfg=cfg)
+    return grid, start, goal
 
 
 def _neighbors_in_bounds(grid: Grid, p: Pos) -> list[Pos]:
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+
+from .grid import FlatGrid, Pos
+from .maze import make_maze
+
+# On-disk maze: a fixed header (size, seed, start, goal) followed by the walls, either
+# bit-packed (1 bit per cell, bit k of byte j = cell 8*j + k) or one byte per cell in
+# FlatGrid.cells layout. The byte layout is 8x bigger but opens without reading: cells are
+# a copy-on-write view of the mapped file, so workers that open the same file share
+# its pages through the OS page cache, and a set_wall() only copies the page it touches.
+# Bit-packed files are unpacked with eight C-level passes on open.
+
+_MAGIC = b"WPMZ"
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sBBHiiqiiii")  # magic, format, bits per cell, reserved, w, h, seed, sx, sy, gx, gy
+_NO_SEED = -1
+
+# _UNPACK[k][b] = bit k of b; _PACK[k][v] = 1 << k for any nonzero v
+_UNPACK = [bytes((b >> k) & 1 for b in range(256)) for k in range(8)]
+_PACK = [bytes([0] + [1 << k] * 255) for k in range(8)]
+
+
+@dataclass
+class MazeFile:
+    grid: FlatGrid
+    start: Pos
+    goal: Pos
+    seed: int | None
+
+
+def pack_bits(cells) -> bytes:
+    n = len(cells)
+    m = (n + 7) // 8
+    acc = 0
+    for k in range(8):
+        lane = bytes(cells[k::8]).translate(_PACK[k])
+        acc |= int.from_bytes(lane.ljust(m, b"\0"), "little")
+    return acc.to_bytes(m, "little")
+
+
+def unpack_bits(packed, n: int) -> bytearray:
+    cells = bytearray(n)
+    packed = bytes(packed)
+    for k in range(8):
+        count = len(range(k, n, 8))
+        cells[k::8] = packed[:count].translate(_UNPACK[k])
+    return cells
+
+
+def save_maze(path: str, grid: FlatGrid, start: Pos, goal: Pos, seed: int | None = None, packed: bool = True) -> None:
+    # packed=False writes the byte-per-cell layout that open_maze() maps without copying.
+    # Written to a temp file and renamed, so readers never see a half-written maze.
+    header = _HEADER.pack(
+        _MAGIC, _FORMAT_VERSION, 1 if packed else 8, 0, grid.width, grid.height,
+        _NO_SEED if seed is None else seed, start[0], start[1], goal[0], goal[1],
+    )
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(pack_bits(grid.cells) if packed else grid.cells)
+    os.replace(tmp, path)
+
+
+def open_maze(path: str) -> MazeFile:
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    if len(mm) < _HEADER.size:
+        raise ValueError(f"{path}: not a maze file")
+    magic, fmt, bits, _, w, h, seed, sx, sy, gx, gy = _HEADER.unpack_from(mm)
+    if magic != _MAGIC or fmt != _FORMAT_VERSION or bits not in (1, 8):
+        raise ValueError(f"{path}: not a maze file (or an unsupported format version)")
+
+    n = w * h
+    off = _HEADER.size
+    expected = off + ((n + 7) // 8 if bits == 1 else n)
+    if len(mm) != expected:
+        raise ValueError(f"{path}: expected {expected} bytes for a {w}x{h} maze, got {len(mm)}")
+
+    view = memoryview(mm)[off:]
+    if bits == 1:
+        cells = unpack_bits(view, n)
+        view.release()
+        mm.close()
+    else:
+        cells = view  # keeps the mapping alive for as long as the grid uses it
+    grid = FlatGrid(w, h, cells)  # type: ignore[arg-type]
+    return MazeFile(grid, (sx, sy), (gx, gy), None if seed == _NO_SEED else seed)
+
+
+def cached_maze(
+    maze_dir: str, width: int, height: int, seed: int, algorithm: str = "backtracker", **options: float
+) -> MazeFile:
+    # make_maze() through a directory of maze files: generated and saved on first use,
+    # memory-mapped afterwards (concurrent writers just race to the same rename)
+    extra = "".join(f"-{k}{v:g}" for k, v in sorted(options.items()) if v)
+    path = os.path.join(maze_dir, f"{algorithm}-{width}x{height}-s{seed}{extra}.wpmz")
+    if not os.path.exists(path):
+        os.makedirs(maze_dir, exist_ok=True)
+        grid, start, goal = make_maze(width, height, seed, algorithm, **options)
+        save_maze(path, grid, start, goal, seed, packed=False)
+    return open_maze(path)
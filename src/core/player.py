@@ -1,6 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..algorithms.field import DistanceField
 
 Pos = tuple[int, int]
 
@@ -19,6 +23,13 @@ class Player:
         if self.path:
             self.pos = self.path[0]
 
+    def follow(self, field: "DistanceField") -> bool:
+        # Route from the current position to the field's source; False if unreachable.
+        # The field is only read, so any number of players can share one.
+        path = field.path_from(self.pos)
+        self.set_path(path)
+        return bool(path)
+
     def is_done(self) -> bool:
         return (not self.path) or (self._path_index >= len(self.path) - 1)
 
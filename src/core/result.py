@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass, field
 from typing import Any
 
+from .trace import PackedTrace
+
 Pos = tuple[int, int]
 
 
@@ -11,6 +14,11 @@ class SearchStats:
     expanded: int = 0
     visited: int = 0
     path_length: int = 0
+    # Open-list operations (A*): pushes = entries added (not decrease-keys),
+    # stale_pops = popped entries that were already closed and got skipped
+    pushes: int = 0
+    pops: int = 0
+    stale_pops: int = 0
 
 
 @dataclass
@@ -23,6 +31,10 @@ class SearchResult:
     visited_order: list[Pos] = field(default_factory=list)
     came_from: dict[Pos, Pos | None] = field(default_factory=dict)
 
+    # Compact mode (AlgorithmConfig.compact): cell ids (y * width + x) instead of Pos keys
+    visited_ids: array = field(default_factory=lambda: array("i"))
+    parents: array | None = None  # parent id per cell, -1 = not reached
+
     stats: SearchStats = field(default_factory=SearchStats)
 
-    trace: list[tuple[str, Any]] = field(default_factory=list)
+    trace: list[tuple[str, Any]] | PackedTrace = field(default_factory=list)
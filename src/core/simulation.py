@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import random
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Protocol
+
+from ..algorithms.cache import PathCache
+from ..algorithms.common import SearchStepper
+from ..config import (
+    GRID_W, GRID_H, START_POS, GOAL_POS, SEARCH_STEP_DELAY_MS, PLAYER_STEP_DELAY_MS,
+    CROWD_SIZE, CROWD_STEP_DELAY_MS, MAZE_SEED, MAZE_ALGORITHM, MAZE_BRAID, MAZE_LOOP_DENSITY,
+    MAZE_OBSTACLE_DENSITY,
+)
+from ..utils.timing import StepTimer
+from .grid import FlatGrid, Pos
+from .maze import MazeConfig, MazeGenerator
+from .mazefile import open_maze, save_maze
+from .player import Player
+from .trace import BACKWARD, DONE, FRONTIER_ADD, FRONTIER_POP, LEVEL, PATH, VISIT
+
+if TYPE_CHECKING:
+    from .crowd import Crowd
+
+# The app's state machine without pygame: maze generation, trace playback, player and
+# crowd movement. Time only moves when update() is called, with whatever dt the caller
+# picks (real frame time, a fixed virtual step, or None for "as fast as possible").
+# A front-end attaches as an observer and is told which cells changed.
+
+class AppState:
+    EMPTY = "EMPTY"
+    MAZE_READY = "MAZE_READY"
+    SEARCHING = "SEARCHING"
+    MOVING = "MOVING"
+    WIN = "WIN"
+
+
+def _default_maze() -> MazeConfig:
+    return MazeConfig(
+        seed=MAZE_SEED,
+        algorithm=MAZE_ALGORITHM,
+        braid=MAZE_BRAID,
+        loop_density=MAZE_LOOP_DENSITY,
+        obstacle_density=MAZE_OBSTACLE_DENSITY,
+    )
+
+
+@dataclass(frozen=True)
+class SimConfig:
+    width: int = GRID_W
+    height: int = GRID_H
+    start: Pos = START_POS
+    goal: Pos = GOAL_POS
+    search_step_ms: int = SEARCH_STEP_DELAY_MS
+    player_step_ms: int = PLAYER_STEP_DELAY_MS
+    crowd_step_ms: int = CROWD_STEP_DELAY_MS
+    crowd_size: int = CROWD_SIZE
+    maze: MazeConfig = field(default_factory=_default_maze)
+
+
+class SimObserver(Protocol):
+    # What the simulation reports to a front-end; the renderers implement both
+    def mark(self, p: Pos) -> None: ...
+
+    def invalidate(self) -> None: ...
+
+
+class Simulation:
+    def __init__(self, cfg: SimConfig | None = None) -> None:
+        self.cfg = cfg or SimConfig()
+        self.observers: list[SimObserver] = []
+
+        self.state = AppState.EMPTY
+        self.start: Pos = self.cfg.start
+        self.goal: Pos = self.cfg.goal
+
+        self.grid: FlatGrid | None = None
+        self._seed: int | None = None  # seed the current maze was generated from, if known
+        self.player: Player | None = None
+        self.crowd: Crowd | None = None
+
+        # Search visualization state
+        self.visited: set[Pos] = set()
+        self.frontier: set[Pos] = set()
+        self.visited_back: set[Pos] = set()  # goal-side search (bidirectional)
+        self.frontier_back: set[Pos] = set()
+        self.path: list[Pos] = []
+
+        # Trace playback (events are pulled from a cached search result as time passes)
+        self.search: SearchStepper | None = None
+        self._by_level = False
+        self.path_cache = PathCache()
+        self.search_timer = StepTimer(step_delay_ms=self.cfg.search_step_ms)
+        self.player_timer = StepTimer(step_delay_ms=self.cfg.player_step_ms)
+
+    # -- commands --
+
+    def generate_maze(self, seed: int | None = None) -> None:
+        # seed=None keeps the configured maze seed (which may itself be None = random)
+        cfg = self.cfg
+        maze = cfg.maze if seed is None else replace(cfg.maze, seed=seed)
+        self.start, self.goal = cfg.start, cfg.goal
+        self.grid = FlatGrid.filled(cfg.width, cfg.height, wall=True)
+        MazeGenerator.generate(self.grid, start=self.start, goal=self.goal, cfg=maze)
+        self._seed = maze.seed
+        self._maze_ready()
+
+    def load_maze(self, path: str) -> None:
+        # A saved maze (core.mazefile) replaces the configured size/start/goal
+        m = open_maze(path)
+        self.grid = m.grid
+        self._seed = m.seed
+        self.start, self.goal = m.start, m.goal
+        self._maze_ready()
+
+    def save_maze(self, path: str, packed: bool = True) -> None:
+        if self.grid is not None:
+            save_maze(path, self.grid, self.start, self.goal, self._seed, packed)
+
+    def _maze_ready(self) -> None:
+        self.player = Player(pos=self.start)
+        self.crowd = None
+        self.reset_visuals()
+        self.state = AppState.MAZE_READY
+
+    def can_search(self) -> bool:
+        return self.grid is not None and self.state in (AppState.MAZE_READY, AppState.WIN)
+
+    def start_search(self, algo: str) -> None:
+        # `algo` is a registry name ("bfs", "astar", ...)
+        if self.grid is None:
+            return
+
+        self.reset_visuals()
+        self.player = Player(pos=self.start)
+
+        # Played back while it runs; same maze + same algorithm = cache hit, only the
+        # playback repeats
+        self.search = self.path_cache.stream(algo, self.grid, self.start, self.goal)
+        self._by_level = False
+        self.state = AppState.SEARCHING
+
+    def spawn_crowd(self, count: int | None = None, rnd: random.Random | None = None) -> None:
+        grid = self.grid
+        if grid is None:
+            return
+        if self.crowd is None:
+            from .crowd import Crowd  # pulls in the distance fields; most sessions never spawn
+
+            self.crowd = Crowd(grid, step_delay_ms=self.cfg.crowd_step_ms)
+        rnd = rnd or random.Random()
+        cells = grid.cells
+        free = [i for i in range(grid.size) if not cells[i]]
+        k = self.cfg.crowd_size if count is None else count
+        for cell, n in Counter(rnd.choices(free, k=k)).items():
+            self.crowd.spawn(grid.pos(cell), self.goal, n)
+
+    def reset_visuals(self) -> None:
+        self.visited.clear()
+        self.frontier.clear()
+        self.visited_back.clear()
+        self.frontier_back.clear()
+        self.path = []  # may alias a cached result: rebind, never clear in place
+        for o in self.observers:
+            o.invalidate()
+
+        if self.search is not None:
+            self.search.abort()
+        self.search = None
+        self.search_timer.reset()
+        self.search_timer.paused = False
+
+        self.player_timer.reset()
+        self.player_timer.paused = False
+
+    # -- time --
+
+    @property
+    def busy(self) -> bool:
+        return self.state in (AppState.SEARCHING, AppState.MOVING)
+
+    def update(self, dt_ms: int | None) -> None:
+        # One tick of dt_ms virtual milliseconds. None finishes the running search and
+        # walk at once (no timers), for headless runs that only want the outcome.
+        searching = self.state == AppState.SEARCHING
+        if searching:
+            self._update_search(dt_ms)
+        # With real timers the walk starts on the tick after the search ends
+        if self.state == AppState.MOVING and (not searching or dt_ms is None):
+            self._update_player(dt_ms)
+        if self.crowd is not None and dt_ms is not None:
+            self.crowd.update(dt_ms)
+
+    def run_until_idle(self, dt_ms: int | None = None, max_ticks: int = 10_000_000) -> int:
+        # Runs the current search + walk to the end; returns the number of ticks used
+        ticks = 0
+        while self.busy and ticks < max_ticks:
+            self.update(dt_ms)
+            ticks += 1
+        return ticks
+
+    def _update_search(self, dt_ms: int | None) -> None:
+        search = self.search
+        if search is None or search.done:
+            # Fallback (ako trace nema "done")
+            self._search_finished()
+            return
+
+        if dt_ms is None:
+            self._fast_forward(search)
+            return
+
+        self.search_timer.update(dt_ms)
+        # Ako smo dobili done, search.done prekida dalje korake u ovom tick-u
+        while self.search_timer.is_ready() and not search.done:
+            batch = search.step_level() if self._by_level else search.step(1)
+            for code, cell in batch:
+                self._apply_trace_event(code, cell)
+            if batch and batch[-1][0] == LEVEL:
+                self._by_level = True  # level-synchronous: one whole wavefront per step from here on
+            self.search_timer.consume()
+
+    def _fast_forward(self, search: SearchStepper) -> None:
+        # Same bookkeeping as _apply_trace_event, on cell ids in local sets; positions
+        # are built once at the end and observers get a single invalidate()
+        sides = ((set(), set()), (set(), set()))  # (visited, frontier) forward / backward
+        for code, cell in search:
+            visited, frontier = sides[1 if code & BACKWARD else 0]
+            code &= ~BACKWARD
+            if code == FRONTIER_ADD:
+                frontier.add(cell)
+            elif code == FRONTIER_POP:
+                frontier.discard(cell)
+            elif code == VISIT:
+                visited.add(cell)
+                frontier.discard(cell)
+            elif code == PATH:
+                self.path = search.result.path
+
+        w = search.width
+        targets = ((self.visited, self.frontier), (self.visited_back, self.frontier_back))
+        for (ids_v, ids_f), (pos_v, pos_f) in zip(sides, targets):
+            pos_v.update((c % w, c // w) for c in ids_v)
+            pos_f.update((c % w, c // w) for c in ids_f)
+        for o in self.observers:
+            o.invalidate()
+        self._search_finished()
+
+    def _search_finished(self) -> None:
+        # Prelaz u MOVING ako postoji putanja
+        if self.path and self.player is not None:
+            self.player.set_path(self.path)
+            self.state = AppState.MOVING
+        else:
+            self.state = AppState.MAZE_READY
+
+    def _update_player(self, dt_ms: int | None) -> None:
+        player = self.player
+        if player is None:
+            self.state = AppState.MAZE_READY
+            return
+
+        step = self.cfg.player_step_ms
+        if dt_ms is None:
+            dt_ms = step * max(1, len(player.path))
+        player.update(dt_ms, step_delay_ms=step)
+        if player.pos == self.goal and player.is_done():
+            self.state = AppState.WIN
+
+    # -- trace events --
+
+    def _mark(self, p: Pos) -> None:
+        for o in self.observers:
+            o.mark(p)
+
+    def _apply_trace_event(self, code: int, cell: int) -> None:
+        search = self.search
+        if search is None:
+            return
+        if code & BACKWARD:
+            self._apply_back_event(code & ~BACKWARD, search.pos(cell))
+        elif code == FRONTIER_ADD:
+            p = search.pos(cell)
+            self.frontier.add(p)
+            self._mark(p)
+        elif code == FRONTIER_POP:
+            p = search.pos(cell)
+            self.frontier.discard(p)
+            self._mark(p)
+        elif code == VISIT:
+            p = search.pos(cell)
+            self.visited.add(p)
+            self.frontier.discard(p)
+            self._mark(p)
+        elif code == PATH:
+            self.path = search.result.path
+        elif code == DONE:
+            self._search_finished()
+
+    def _apply_back_event(self, code: int, p: Pos) -> None:
+        if code == FRONTIER_ADD:
+            self.frontier_back.add(p)
+        elif code == FRONTIER_POP:
+            self.frontier_back.discard(p)
+        elif code == VISIT:
+            self.visited_back.add(p)
+            self.frontier_back.discard(p)
+        self._mark(p)
+
+    def state_label(self) -> str:
+        if self.state == AppState.EMPTY:
+            return "Status: no maze (click Generate)"
+        if self.state == AppState.MAZE_READY:
+            return "Status: maze ready (choose)"
+        if self.state == AppState.SEARCHING:
+            return "Status: searching..."
+        if self.state == AppState.MOVING:
+            return "Status: moving to goal..."
+        return "Status: WIN"
+
+    def stats_line(self) -> str:
+        visited = len(self.visited) + len(self.visited_back)
+        frontier = len(self.frontier) + len(self.frontier_back)
+        return f"Visited: {visited} | Frontier: {frontier} | Path: {len(self.path)}"
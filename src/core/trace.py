@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+Pos = tuple[int, int]
+
+# Event codes (one byte per event in PackedTrace.codes)
+INIT = 0
+FRONTIER_ADD = 1
+FRONTIER_POP = 2
+VISIT = 3
+GOAL_FOUND = 4
+PATH = 5
+DONE = 6
+LEVEL = 7  # level-synchronous searches: all events of BFS depth `cell` are out
+
+EVENT_NAMES = ("init", "frontier_add", "frontier_pop", "visit", "goal_found", "path", "done", "level")
+EVENT_CODES = {name: code for code, name in enumerate(EVENT_NAMES)}
+
+# Bidirectional searches OR this into the code for events of the goal-side search;
+# unpacked, those events are named e.g. "visit_back".
+BACKWARD = 0x80
+
+
+@dataclass
+class PackedTrace:
+    # Event stream as two parallel buffers: code byte + cell id (y * width + x).
+    # Non-cell payloads: "path" -> self.path, "done" -> cell is 1/0 (found), "init" -> algo/start/goal,
+    # "level" -> cell is the depth.
+    width: int
+    algo: str = ""
+    start: Pos = (0, 0)
+    goal: Pos = (0, 0)
+
+    codes: bytearray = field(default_factory=bytearray)
+    cells: array = field(default_factory=lambda: array("i"))
+    path: list[Pos] = field(default_factory=list)
+
+    def append(self, code: int, cell: int = -1) -> None:
+        self.codes.append(code)
+        self.cells.append(cell)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, i: int) -> tuple[int, int]:
+        return self.codes[i], self.cells[i]
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return zip(self.codes, self.cells)
+
+    def nbytes(self) -> int:
+        return len(self.codes) + self.cells.itemsize * len(self.cells)
+
+    def pos(self, cell: int) -> Pos:
+        y, x = divmod(cell, self.width)
+        return x, y
+
+    def decode(self, code: int, cell: int) -> tuple[str, Any]:
+        if code & BACKWARD:
+            return EVENT_NAMES[code & ~BACKWARD] + "_back", self.pos(cell)
+        if code == INIT:
+            return "init", {"algo": self.algo, "start": self.start, "goal": self.goal}
+        if code == PATH:
+            return "path", self.path
+        if code == DONE:
+            return "done", {"found": bool(cell)}
+        if code == LEVEL:
+            return "level", cell
+        return EVENT_NAMES[code], self.pos(cell)
+
+    def events(self) -> Iterator[tuple[str, Any]]:
+        # Same (event, payload) tuples as the unpacked trace
+        for code, cell in zip(self.codes, self.cells):
+            yield self.decode(code, cell)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from dataclasses import dataclass
+
+from .algorithms.registry import ALGORITHMS
+from .cli_args import parse_seeds, parse_size
+from .core.simulation import AppState, SimConfig, Simulation
+
+# Runs the app's episode loop (generate -> search playback -> walk to the goal) without
+# pygame. By default time is fast-forwarded; --timestep replays it in fixed virtual steps,
+# tick for tick what the window would show at that frame time, just without waiting.
+
+
+@dataclass(frozen=True)
+class Episode:
+    seed: int
+    algo: str
+    won: bool
+    ticks: int
+    visited: int
+    path_length: int
+
+
+def run_episode(sim: Simulation, seed: int, algo: str, timestep_ms: int | None = None) -> Episode:
+    sim.generate_maze(seed)
+    sim.start_search(algo)
+    ticks = sim.run_until_idle(timestep_ms)
+    return Episode(
+        seed, algo, sim.state == AppState.WIN, ticks, len(sim.visited) + len(sim.visited_back), len(sim.path)
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m src.headless", description="Run app episodes without a window")
+    ap.add_argument("--size", default="51x51", help="WxH maze size")
+    ap.add_argument("--seeds", nargs="+", default=["0-999"], help="seeds or inclusive ranges like 0-999")
+    ap.add_argument("--algos", nargs="+", default=["astar"], choices=list(ALGORITHMS))
+    ap.add_argument("--timestep", type=int, default=None, help="fixed virtual ms per tick (default: fast-forward)")
+    ap.add_argument("--verbose", action="store_true", help="print one line per episode")
+    args = ap.parse_args(argv)
+
+    w, h = parse_size(args.size)
+    sim = Simulation(SimConfig(width=w, height=h, start=(1, 1), goal=(w - 2, h - 2)))
+    seeds = parse_seeds(args.seeds)
+
+    episodes = wins = ticks = 0
+    t0 = time.perf_counter()
+    for seed in seeds:
+        for algo in args.algos:
+            ep = run_episode(sim, seed, algo, args.timestep)
+            episodes += 1
+            wins += ep.won
+            ticks += ep.ticks
+            if args.verbose:
+                print(f"seed={ep.seed} algo={ep.algo} won={int(ep.won)} ticks={ep.ticks} "
+                      f"visited={ep.visited} path={ep.path_length}")
+    elapsed = time.perf_counter() - t0
+
+    rate = episodes / elapsed if elapsed > 0 else float("inf")
+    print(f"{episodes} episodes, {wins} won, {ticks} ticks in {elapsed:.2f}s ({rate:.0f} episodes/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
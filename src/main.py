@@ -1,11 +1,21 @@
 from __future__ import annotations
 
-from .ui.app import App
+import sys
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "--headless":
+        # No window: pygame is never imported
+        from .headless import main as headless_main
+
+        return headless_main(argv[1:])
+
+    from .ui.app import App
+
     App().run()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
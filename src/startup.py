@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Cold-start timing. Every run is a fresh interpreter (`python -m src.startup --child`)
+# that reports how long each startup phase took; the parent adds the total process
+# time, which includes interpreter startup and teardown.
+#   app:      import src.ui.app -> App() (window + fonts) -> first frame drawn
+#   headless: import src.headless -> Simulation() -> first episode played
+# For CI without a display, run with SDL_VIDEODRIVER=dummy.
+
+PHASES = ("import", "init", "first_frame")
+
+
+def _child(target: str) -> dict[str, float]:
+    t0 = time.perf_counter()
+    if target == "headless":
+        from .core.simulation import Simulation
+        from .headless import run_episode
+
+        t1 = time.perf_counter()
+        sim = Simulation()
+        t2 = time.perf_counter()
+        run_episode(sim, seed=0, algo="astar")
+    else:
+        from .ui.app import App
+
+        t1 = time.perf_counter()
+        app = App()
+        t2 = time.perf_counter()
+        app.render()
+    t3 = time.perf_counter()
+    if target == "app":
+        import pygame
+
+        pygame.quit()
+    return {"import": (t1 - t0) * 1000, "init": (t2 - t1) * 1000, "first_frame": (t3 - t2) * 1000}
+
+
+def measure(target: str = "app", runs: int = 5) -> list[dict[str, float]]:
+    # One dict per run: the PHASES in ms plus "total" (process spawn to exit)
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    cmd = [sys.executable, "-m", f"{__package__}.startup", "--child", target]
+    samples: list[dict[str, float]] = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        out = subprocess.run(cmd, env=env, capture_output=True, text=True, check=True).stdout
+        total = (time.perf_counter() - t0) * 1000
+        sample = json.loads(out.strip().splitlines()[-1])
+        sample["total"] = total
+        samples.append(sample)
+    return samples
+
+
+def summarize(samples: list[dict[str, float]]) -> dict[str, float]:
+    # Median per phase (robust against a single slow run on a busy box)
+    return {k: statistics.median(s[k] for s in samples) for k in (*PHASES, "total")}
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m src.startup", description="Measure cold-start time")
+    ap.add_argument("target", nargs="?", choices=("app", "headless"), default="app")
+    ap.add_argument("--runs", type=int, default=5, help="fresh interpreters to start")
+    ap.add_argument("--max-ms", type=float, help="exit 1 if the median total exceeds this")
+    ap.add_argument("--json", action="store_true", help="print the medians as JSON")
+    ap.add_argument("--child", choices=("app", "headless"), help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_child(args.child)))
+        return 0
+
+    med = summarize(measure(args.target, args.runs))
+    if args.json:
+        print(json.dumps({"target": args.target, "runs": args.runs, **med}))
+    else:
+        labels = PHASES[:-1] + (("first_episode",) if args.target == "headless" else ("first_frame",))
+        parts = " | ".join(f"{label} {med[k]:.1f}ms" for label, k in zip(labels, PHASES))
+        print(f"{args.target}: total {med['total']:.1f}ms ({parts}), median of {args.runs}")
+
+    if args.max_ms is not None and med["total"] > args.max_ms:
+        print(f"REGRESSION startup {med['total']:.1f}ms > {args.max_ms:.1f}ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
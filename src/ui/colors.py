@@ -10,9 +10,12 @@ FLOOR = (32, 32, 40)
 START = (70, 180, 120)
 GOAL = (220, 170, 60)
 PLAYER = (90, 140, 255)
+AGENT = (240, 110, 90)  # crowd agents
 
 VISITED = (120, 120, 155)
 FRONTIER = (160, 120, 200)
+VISITED_BACK = (110, 150, 140)  # goal-side search of bidirectional algorithms
+FRONTIER_BACK = (110, 200, 170)
 PATH = (240, 240, 240)
 
 BTN = (50, 50, 62)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Iterable
+
 import pygame
 
 from ..core.grid import Grid, Pos
@@ -41,16 +43,35 @@ class Renderer:
         buttons,
         panel_w: int,
         window_h: int,
+        visited_back: set[Pos] | None = None,
+        frontier_back: set[Pos] | None = None,
+        agents: Iterable[tuple[Pos, int]] | None = None,
     ) -> None:
         self.surface.fill(colors.BG)
 
+        self._draw_panel(state_label, stats_line, buttons, panel_w, window_h)
+
+        # Grid draw
+        if grid is not None:
+            self._draw_grid(grid, start, goal, player, visited, frontier, path,
+                            visited_back or set(), frontier_back or set())
+            if agents is not None:
+                self._draw_agents(agents)
+
+        pygame.display.flip()
+
+    def mark(self, p: Pos) -> None:
+        # Full redraw every frame, nothing to track
+        pass
+
+    def invalidate(self) -> None:
+        pass
+
+    def _draw_panel(self, state_label: str, stats_line: str, buttons, panel_w: int, window_h: int) -> pygame.Rect:
         # Panel background
         px, py = self.panel_origin
-        pygame.draw.rect(
-            self.surface,
-            colors.PANEL_BG,
-            pygame.Rect(px, 0, panel_w, window_h),
-        )
+        panel = pygame.Rect(px, 0, panel_w, window_h)
+        pygame.draw.rect(self.surface, colors.PANEL_BG, panel)
 
         # Title + status
         title = self.font.render("Wrath of the Path", True, colors.TEXT)
@@ -66,11 +87,7 @@ class Renderer:
         for b in buttons:
             b.draw(self.surface, self.small_font)
 
-        # Grid draw
-        if grid is not None:
-            self._draw_grid(grid, start, goal, player, visited, frontier, path)
-
-        pygame.display.flip()
+        return panel
 
     def _draw_grid(
         self,
@@ -81,9 +98,12 @@ class Renderer:
         visited: set[Pos],
         frontier: set[Pos],
         path: list[Pos],
+        visited_back: set[Pos],
+        frontier_back: set[Pos],
     ) -> None:
         ox, oy = self.grid_origin
         cs, cg = self.cell_size, self.cell_gap
+        path_set = set(path)
 
         for y in range(grid.height):
             for x in range(grid.width):
@@ -98,11 +118,15 @@ class Renderer:
                     color = colors.FLOOR
 
                 # Overlays
+                if p in visited_back:
+                    color = colors.VISITED_BACK
                 if p in visited:
                     color = colors.VISITED
+                if p in frontier_back:
+                    color = colors.FRONTIER_BACK
                 if p in frontier:
                     color = colors.FRONTIER
-                if p in path:
+                if p in path_set:
                     color = colors.PATH
 
                 if p == start:
@@ -117,3 +141,161 @@ class Renderer:
             sx, sy = grid_to_screen(player.pos, (ox, oy), cs, cg)
             rect = pygame.Rect(sx, sy, cs, cs)
             pygame.draw.rect(self.surface, colors.PLAYER, rect, border_radius=6)
+
+    def _draw_agents(self, agents: Iterable[tuple[Pos, int]]) -> list[pygame.Rect]:
+        # One inset square per occupied cell, however many agents stand on it
+        ox, oy = self.grid_origin
+        cs = self.cell_size
+        step = cs + self.cell_gap
+        inset = max(1, cs // 5)
+        fill = self.surface.fill
+        color = colors.AGENT
+        rects: list[pygame.Rect] = []
+        for (x, y), _ in agents:
+            r = pygame.Rect(ox + x * step, oy + y * step, cs, cs)
+            fill(color, r.inflate(-2 * inset, -2 * inset))
+            rects.append(r)
+        return rects
+
+
+class CachedRenderer(Renderer):
+    # The static maze layer is rendered once per grid. Each frame only the cells marked
+    # by trace events, path changes and the player are repainted, and only their rects
+    # (plus the panel) are pushed with display.update().
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._grid: Grid | None = None
+        self._base: pygame.Surface | None = None  # walls/floor/start/goal
+        self._scene: pygame.Surface | None = None  # base + visited/frontier/path
+        self._dirty: set[Pos] = set()
+        self._full = True
+        self._path_ref: list[Pos] | None = None
+        self._path_len = 0
+        self._path_set: set[Pos] = set()
+
+    def mark(self, p: Pos) -> None:
+        self._dirty.add(p)
+
+    def invalidate(self) -> None:
+        # Overlays were cleared: start again from the static layer
+        if self._base is not None:
+            self._scene = self._base.copy()
+        self._dirty.clear()
+        self._path_ref = None
+        self._path_len = 0
+        self._path_set = set()
+        self._full = True
+
+    def _build_layers(self, grid: Grid, start: Pos, goal: Pos) -> None:
+        cs, cg = self.cell_size, self.cell_gap
+        step = cs + cg
+        base = pygame.Surface((grid.width * step - cg, grid.height * step - cg))
+        base.fill(colors.BG)
+        for y in range(grid.height):
+            for x in range(grid.width):
+                color = colors.WALL if grid.is_wall((x, y)) else colors.FLOOR
+                base.fill(color, (x * step, y * step, cs, cs))
+        for p, color in ((start, colors.START), (goal, colors.GOAL)):
+            base.fill(color, (p[0] * step, p[1] * step, cs, cs))
+
+        self._grid = grid
+        self._base = base
+        self.invalidate()
+
+    def draw(
+        self,
+        grid: Grid | None,
+        start: Pos,
+        goal: Pos,
+        player: Player | None,
+        visited: set[Pos],
+        frontier: set[Pos],
+        path: list[Pos],
+        state_label: str,
+        stats_line: str,
+        buttons,
+        panel_w: int,
+        window_h: int,
+        visited_back: set[Pos] | None = None,
+        frontier_back: set[Pos] | None = None,
+        agents: Iterable[tuple[Pos, int]] | None = None,
+    ) -> None:
+        if grid is None:
+            self._grid = None
+            super().draw(grid, start, goal, player, visited, frontier, path,
+                         state_label, stats_line, buttons, panel_w, window_h, visited_back, frontier_back)
+            return
+
+        if grid is not self._grid:
+            self._build_layers(grid, start, goal)
+
+        dirty = self._dirty
+        if path is not self._path_ref or len(path) != self._path_len:
+            dirty |= self._path_set
+            self._path_set = set(path)
+            self._path_ref = path
+            self._path_len = len(path)
+            dirty |= self._path_set
+
+        ox, oy = self.grid_origin
+        cs = self.cell_size
+        step = cs + self.cell_gap
+        scene = self._scene
+        assert scene is not None
+        path_set = self._path_set
+        visited_back = visited_back or set()
+        frontier_back = frontier_back or set()
+
+        rects: list[pygame.Rect] = []
+        for p in dirty:
+            if p == start:
+                color = colors.START
+            elif p == goal:
+                color = colors.GOAL
+            elif p in path_set:
+                color = colors.PATH
+            elif p in frontier:
+                color = colors.FRONTIER
+            elif p in frontier_back:
+                color = colors.FRONTIER_BACK
+            elif p in visited:
+                color = colors.VISITED
+            elif p in visited_back:
+                color = colors.VISITED_BACK
+            else:
+                color = colors.WALL if grid.is_wall(p) else colors.FLOOR
+            x, y = p
+            scene.fill(color, (x * step, y * step, cs, cs))
+            rects.append(pygame.Rect(ox + x * step, oy + y * step, cs, cs))
+        dirty.clear()
+
+        if self._full:
+            self.surface.fill(colors.BG)
+            self.surface.blit(scene, (ox, oy))
+        else:
+            for r in rects:
+                self.surface.blit(scene, r, pygame.Rect(r.x - ox, r.y - oy, cs, cs))
+
+        # Player on top; its cell is marked so the next frame restores it from the scene
+        if player is not None:
+            x, y = player.pos
+            r = pygame.Rect(ox + x * step, oy + y * step, cs, cs)
+            pygame.draw.rect(self.surface, colors.PLAYER, r, border_radius=6)
+            rects.append(r)
+            self.mark(player.pos)
+
+        # Agents likewise: drawn over the scene, restored from it next frame
+        if agents is not None:
+            agents = list(agents)
+            rects += self._draw_agents(agents)
+            for p, _ in agents:
+                self.mark(p)
+
+        rects.append(self._draw_panel(state_label, stats_line, buttons, panel_w, window_h))
+
+        if self._full:
+            pygame.display.flip()
+            self._full = False
+        else:
+            pygame.display.update(rects)
@@ -0,0 +1,84 @@
+from src.algorithms.cache import REPLAY_CFG, PathCache, result_nbytes
+from src.algorithms.common import AlgorithmConfig
+from src.core.maze import make_maze
+
+_CFG = AlgorithmConfig(emit_trace=False)
+
+
+def _goals(grid, k):
+    # k distinct open cells to search to
+    return [grid.pos(i) for i in range(grid.size - 1, -1, -1) if not grid.cells[i]][:k]
+
+
+def test_lru_evicts_by_count():
+    grid, start, _ = make_maze(21, 21, 1)
+    a, b, c = _goals(grid, 3)
+    cache = PathCache(max_entries=2)
+    first = cache.search("bfs", grid, start, a, _CFG)
+    cache.search("bfs", grid, start, b, _CFG)
+    assert cache.search("bfs", grid, start, a, _CFG) is first  # a is now the newest
+    cache.search("bfs", grid, start, c, _CFG)  # evicts b
+    info = cache.info()
+    assert (info.entries, info.evictions, info.hits, info.misses) == (2, 1, 1, 3)
+    assert cache.search("bfs", grid, start, a, _CFG) is first
+    cache.search("bfs", grid, start, b, _CFG)
+    assert cache.info().misses == 4
+
+
+def test_lru_evicts_by_bytes():
+    grid, start, goal = make_maze(21, 21, 2)
+    res = PathCache().search("bfs", grid, start, goal, _CFG)
+    size = result_nbytes(res)
+    cache = PathCache(max_bytes=2 * size)
+    goals = _goals(grid, 3)
+    keys = [cache.key("bfs", grid, start, g, _CFG) for g in goals]
+    cache.put(keys[0], res)
+    cache.put(keys[1], res)
+    assert cache.nbytes == 2 * size and cache.evictions == 0
+    cache.put(keys[2], res)  # evicts the oldest
+    assert len(cache) == 2 and cache.nbytes == 2 * size and cache.evictions == 1
+    assert cache.search("bfs", grid, start, goals[2], _CFG) is res
+    assert cache.search("bfs", grid, start, goals[0], _CFG) is not res
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    tiny = PathCache(max_bytes=size - 1)
+    tiny.put(keys[0], res)  # never fits: not stored, nothing evicted
+    assert len(tiny) == 0 and tiny.nbytes == 0
+
+
+def test_set_wall_invalidates():
+    grid, start, goal = make_maze(21, 21, 3, braid=0.5)
+    cache = PathCache()
+    res = cache.search("bfs", grid, start, goal, _CFG)
+    assert cache.search("bfs", grid, start, goal, _CFG) is res
+    grid.set_wall(res.path[len(res.path) // 2], True)
+    fresh = cache.search("bfs", grid, start, goal, _CFG)
+    assert fresh is not res
+    assert cache.info().misses == 2
+    assert not fresh.found or fresh.path != res.path
+
+
+def test_stream_records_on_miss_and_replays_on_hit():
+    grid, start, goal = make_maze(21, 21, 4)
+    cache = PathCache()
+    live = cache.stream("bfs", grid, start, goal)
+    recorded = list(live)
+    assert live.result.found and len(cache) == 1
+
+    replay = cache.stream("bfs", grid, start, goal)
+    assert list(replay) == recorded
+    assert replay.result is live.result
+    assert cache.info().hits == 1
+    # search() with the replay config shares the entry
+    assert cache.search("bfs", grid, start, goal, REPLAY_CFG) is live.result
+
+
+def test_aborted_stream_is_not_cached():
+    grid, start, goal = make_maze(21, 21, 5)
+    cache = PathCache()
+    stepper = cache.stream("bfs", grid, start, goal)
+    stepper.step(5)
+    stepper.abort()
+    assert len(cache) == 0
+    list(cache.stream("bfs", grid, start, goal))
+    assert cache.info().misses == 2 and len(cache) == 1
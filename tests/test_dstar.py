@@ -0,0 +1,36 @@
+import random
+
+from src.algorithms.bfs import run as bfs_run
+from src.algorithms.common import AlgorithmConfig
+from src.algorithms.dstar import DStarLite
+from src.core.maze import make_maze
+
+
+def _replan_matches_bfs(build_adjacency: bool) -> None:
+    for seed in range(10):
+        grid, start, goal = make_maze(31, 31, seed, braid=0.5)
+        planner = DStarLite(grid, start, goal)
+        planner.plan()
+        rnd = random.Random(seed)
+        for _ in range(4):
+            res = planner.plan()
+            if len(res.path) < 3:
+                break
+            grid.set_wall(rnd.choice(res.path[1:-1]), True)
+            if build_adjacency:
+                grid.adjacency()  # what any other search on the grid would do
+            res = planner.plan()
+            ref = bfs_run(grid, start, goal, AlgorithmConfig(emit_trace=False))
+            assert res.found == ref.found
+            assert len(res.path) == len(ref.path)
+            if res.found:
+                assert res.path[0] == start and res.path[-1] == goal
+        planner.close()
+
+
+def test_replan_after_wall():
+    _replan_matches_bfs(build_adjacency=False)
+
+
+def test_replan_with_adjacency_cached_between_change_and_plan():
+    _replan_matches_bfs(build_adjacency=True)
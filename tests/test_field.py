@@ -0,0 +1,44 @@
+import pytest
+
+from src.algorithms.bfs import run as bfs_run
+from src.algorithms.common import AlgorithmConfig
+from src.algorithms.field import DistanceField, compute
+from src.core.maze import make_maze
+
+
+def test_save_load_round_trip(tmp_path):
+    grid, start, goal = make_maze(21, 15, 6, braid=0.4)
+    field = compute(grid, goal)
+    path = str(tmp_path / "goal.wpdf")
+    field.save(path)
+    loaded = DistanceField.load(path, grid)
+    assert (loaded.width, loaded.height, loaded.source) == (field.width, field.height, goal)
+    assert list(loaded.dist) == list(field.dist)
+    assert list(loaded.parent) == list(field.parent)
+    assert loaded.path_from(start) == field.path_from(start)
+    ref = bfs_run(grid, start, goal, AlgorithmConfig(emit_trace=False))
+    assert loaded.distance(start) == len(ref.path) - 1
+
+
+def test_load_rejects_other_grid(tmp_path):
+    grid, start, goal = make_maze(21, 15, 6)
+    path = str(tmp_path / "goal.wpdf")
+    compute(grid, goal).save(path)
+
+    other, _, _ = make_maze(21, 15, 7)
+    with pytest.raises(ValueError):
+        DistanceField.load(path, other)
+
+    grid.set_wall(start, not grid.cells[grid.index(start)])
+    with pytest.raises(ValueError):
+        DistanceField.load(path, grid)
+    DistanceField.load(path)  # without a grid there is nothing to check against
+
+
+def test_from_bytes_rejects_truncated_data():
+    grid, _, goal = make_maze(11, 11, 2)
+    data = compute(grid, goal).to_bytes()
+    with pytest.raises(ValueError):
+        DistanceField.from_bytes(data[:-4])
+    with pytest.raises(ValueError):
+        DistanceField.from_bytes(b"XXXX" + data[4:])
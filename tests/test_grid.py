@@ -0,0 +1,58 @@
+from src.core.grid import FlatGrid
+from src.core.maze import make_maze
+
+
+def test_neighbor_ids_same_with_and_without_adjacency():
+    grid, _, _ = make_maze(21, 21, 3, braid=0.5)
+    uncached = [grid.neighbor_ids(i) for i in range(grid.size)]
+    grid.adjacency()
+    assert [grid.neighbor_ids(i) for i in range(grid.size)] == uncached
+    assert all(uncached[i] == [] for i in range(grid.size) if grid.cells[i])
+
+
+def test_open_around_sees_past_a_wall():
+    grid = FlatGrid.filled(3, 3, False)
+    grid.set_wall((1, 1), True)
+    grid.adjacency()
+    mid = grid.index((1, 1))
+    assert grid.neighbor_ids(mid) == []
+    assert sorted(grid.open_around(mid)) == sorted(grid.index(p) for p in ((0, 1), (2, 1), (1, 0), (1, 2)))
+
+
+class _Listener:
+    def __init__(self) -> None:
+        self.walls: list[int] = []
+
+    def wall_changed(self, i: int) -> bool:
+        self.walls.append(i)
+        return True
+
+
+def test_cost_edit_keeps_walls_derived_data():
+    grid = FlatGrid.filled(5, 5, False)
+    adj = grid.adjacency()
+    listener = grid.derived("listener", lambda g: _Listener())
+    plain = grid.derived("plain", lambda g: object())
+    version = grid.version
+
+    grid.set_cost((2, 2), 9)
+    assert grid.version > version
+    assert grid.adjacency() is adj
+    assert listener.walls == []
+    assert grid.derived("plain", lambda g: object()) is plain
+
+    grid.set_wall((2, 2), True)
+    assert grid.adjacency() is not adj
+    assert listener.walls == [grid.index((2, 2))]
+    assert grid.derived("plain", lambda g: object()) is not plain
+
+
+def test_fingerprint_follows_cost_edits():
+    from src.algorithms.cache import grid_fingerprint
+
+    grid = FlatGrid.filled(5, 5, False)
+    before = grid_fingerprint(grid)
+    grid.set_cost((1, 1), 3)
+    assert grid_fingerprint(grid) != before
+    grid.set_costs(None)
+    assert grid_fingerprint(grid) == before
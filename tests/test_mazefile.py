@@ -0,0 +1,37 @@
+import pytest
+
+from src.core.maze import make_maze
+from src.core.mazefile import cached_maze, open_maze, save_maze
+
+
+@pytest.mark.parametrize("packed", [True, False])
+@pytest.mark.parametrize("seed", [7, None])
+def test_round_trip(tmp_path, packed, seed):
+    grid, start, goal = make_maze(21, 13, 7, braid=0.3)  # 273 cells: last packed byte is partial
+    path = str(tmp_path / "maze.wpmz")
+    save_maze(path, grid, start, goal, seed, packed=packed)
+    mf = open_maze(path)
+    assert (mf.grid.width, mf.grid.height) == (grid.width, grid.height)
+    assert bytes(mf.grid.cells) == bytes(grid.cells)
+    assert (mf.start, mf.goal, mf.seed) == (start, goal, seed)
+
+
+def test_cached_maze_reuses_file(tmp_path):
+    first = cached_maze(str(tmp_path), 15, 15, 3)
+    again = cached_maze(str(tmp_path), 15, 15, 3)
+    assert bytes(first.grid.cells) == bytes(again.grid.cells)
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+@pytest.mark.parametrize("packed", [True, False])
+def test_corrupt_file_rejected(tmp_path, packed):
+    grid, start, goal = make_maze(15, 15, 1)
+    path = tmp_path / "maze.wpmz"
+    save_maze(str(path), grid, start, goal, 1, packed=packed)
+    data = path.read_bytes()
+
+    bad = tmp_path / "bad.wpmz"
+    for corrupt in (b"", data[:10], b"XXXX" + data[4:], data[:-1], data + b"\0"):
+        bad.write_bytes(corrupt)
+        with pytest.raises(ValueError):
+            open_maze(str(bad))
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from src.algorithms.common import BucketQueue, IndexedHeap
+
+
+@pytest.mark.parametrize("lifo", [False, True])
+def test_bucket_queue_matches_sorted_reference(lifo):
+    rnd = random.Random(7)
+    for _ in range(50):
+        queue = BucketQueue(lifo=lifo)
+        ref: list[tuple[int, int]] = []  # (key, push order)
+        low = 0
+        for seq in range(rnd.randint(1, 200)):
+            if ref and rnd.random() < 0.4:
+                ref.sort(key=lambda e: (e[0], -e[1] if lifo else e[1]))
+                key, item = ref.pop(0)
+                assert queue.pop() == (key, item)
+                low = key
+            else:
+                key = low + rnd.randint(0, 5)
+                queue.push(seq, key)
+                ref.append((key, seq))
+            assert len(queue) == len(ref)
+        ref.sort(key=lambda e: (e[0], -e[1] if lifo else e[1]))
+        assert [queue.pop() for _ in range(len(queue))] == ref
+        assert not queue
+
+
+def test_bucket_queue_rejects_key_below_minimum():
+    queue = BucketQueue()
+    queue.push(1, 3)
+    queue.push(2, 5)
+    assert queue.pop() == (3, 1)
+    with pytest.raises(ValueError):
+        queue.push(3, 2)
+    queue.push(3, 3)  # equal to the last key popped is fine
+    assert queue.pop() == (3, 3)
+
+
+@pytest.mark.parametrize("lifo", [False, True])
+def test_bucket_queue_pop_empty(lifo):
+    queue = BucketQueue(lifo=lifo)
+    with pytest.raises(IndexError):
+        queue.pop()
+    queue.push(0, 1)
+    queue.pop()
+    with pytest.raises(IndexError):
+        queue.pop()
+
+
+def test_indexed_heap_decrease_key():
+    heap = IndexedHeap(10)
+    assert heap.push(4, (8, 0))
+    assert heap.push(5, (6, 0))
+    assert heap.push(6, (7, 0))
+    assert not heap.push(4, (3, 0))  # decrease-key, not a second entry
+    assert not heap.push(5, (9, 0))  # a higher key is ignored
+    assert len(heap) == 3 and 4 in heap
+    assert [heap.pop() for _ in range(3)] == [((3, 0), 4), ((6, 0), 5), ((7, 0), 6)]
+    assert 4 not in heap
+
+
+def test_indexed_heap_matches_sorted_reference():
+    rnd = random.Random(11)
+    heap = IndexedHeap(100)
+    best: dict[int, int] = {}
+    for _ in range(500):
+        item = rnd.randrange(100)
+        key = rnd.randint(0, 1000)
+        assert heap.push(item, (key,)) == (item not in best)
+        best[item] = min(key, best.get(item, key))
+    out = [heap.pop() for _ in range(len(heap))]
+    assert [k for k, _ in out] == sorted(k for k, _ in out)
+    assert {item: k[0] for k, item in out} == best
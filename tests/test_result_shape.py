@@ -0,0 +1,28 @@
+import pytest
+
+from src.algorithms.common import AlgorithmConfig
+from src.algorithms.registry import get_run
+from src.core.maze import make_maze
+
+
+@pytest.mark.parametrize("algo", ["dijkstra", "bibfs", "biastar", "jps", "jps+", "hpa", "corridor", "wavefront"])
+@pytest.mark.parametrize("emit_trace", [False, True])
+def test_pos_form_unless_compact(algo, emit_trace):
+    grid, start, goal = make_maze(31, 31, 4, braid=0.4)
+    run = get_run(algo)
+    res = run(grid, start, goal, AlgorithmConfig(emit_trace=emit_trace))
+    assert res.found
+    w = grid.width
+    assert res.visited_order == [(i % w, i // w) for i in res.visited_ids]
+    assert res.visited_order
+    # came_from leads from the goal back to the start
+    cur = goal
+    for _ in range(grid.size):
+        if res.came_from[cur] is None:
+            break
+        cur = res.came_from[cur]
+    assert cur == start
+
+    compact = run(grid, start, goal, AlgorithmConfig(emit_trace=emit_trace, compact=True))
+    assert compact.visited_order == [] and list(compact.came_from) == [start]
+    assert compact.path == res.path